@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    request.user for ClaimsJWTAuthentication.
+
+    id, username, is_staff, is_superuser and the group names are answered
+    from the access token claims (see accounts.tokens). Anything else, e.g.
+    `serializer.save(author=request.user)`, loads the User row on first use.
+    Tokens issued without the claims simply load the row when asked.
+    """
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: self._load(user_id))
+        self.__dict__["_token"] = token
+
+    @staticmethod
+    def _load(user_id):
+        try:
+            user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+    def _claim(self, name):
+        token = self.__dict__["_token"]
+        if name in token:
+            return token[name]
+        # LazyObject proxy: loads the User and reads the attribute from it
+        return self.__getattr__(name)
+
+    @property
+    def pk(self):
+        # simplejwt stores the id as a string; compare like the model field
+        user_id = self.__dict__["_token"][api_settings.USER_ID_CLAIM]
+        return User._meta.get_field(api_settings.USER_ID_FIELD).to_python(user_id)
+
+    id = pk
+
+    @property
+    def username(self):
+        return self._claim("username")
+
+    @property
+    def is_staff(self):
+        return self._claim("is_staff")
+
+    @property
+    def is_superuser(self):
+        return self._claim("is_superuser")
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __bool__(self):
+        # `if request.user and ...` must not trigger the load
+        return True
+
+    @property
+    def token_groups(self):
+        """Group names from the token, or None if the token predates the claim."""
+        groups = self.__dict__["_token"].get("groups")
+        return frozenset(groups) if groups is not None else None
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the per-request User query: the user is built
+    from the token claims and only loaded from the database if a view needs
+    the real row. A deactivated user keeps access until the access token
+    expires (ACCESS_TOKEN_LIFETIME).
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        return ClaimsUser(validated_token)
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.tokens import ClaimsTokenObtainPairSerializer
+from accounts.views import MeView
+from comments.views import ArticleCommentListCreateView
+from posts.models import Article
+from posts.views import ArticleViewSet
+
+User = get_user_model()
+
+AUTH_CLASSES = {
+    "JWTAuthentication": JWTAuthentication,
+    "ClaimsJWTAuthentication": ClaimsJWTAuthentication,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries per authenticated request with simplejwt's JWTAuthentication "
+        "and ClaimsJWTAuthentication. Works on throwaway rows inside a rolled-back transaction."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = self.run()
+            transaction.set_rollback(True)
+
+        width = max(len(name) for name in results)
+        self.stdout.write(f"{'request':<{width}}  " + "  ".join(f"{a:>23}" for a in AUTH_CLASSES))
+        for name, counts in results.items():
+            self.stdout.write(f"{name:<{width}}  " + "  ".join(f"{counts[a]:>23}" for a in AUTH_CLASSES))
+
+    def run(self):
+        owner = User.objects.create_user("bench-owner", password="bench-pass-123")
+        admin = User.objects.create_user("bench-admin", password="bench-pass-123")
+        admin.groups.add(Group.objects.get_or_create(name="admin")[0])
+        article = Article.objects.create(title="bench", content="bench", author=owner)
+
+        factory = APIRequestFactory()
+        scenarios = {
+            "PATCH own article": (
+                owner,
+                (ArticleViewSet, {"patch": "partial_update"}),
+                lambda: factory.patch(f"/api/articles/{article.pk}/", {"title": "t"}, format="json"),
+                {"pk": article.pk},
+            ),
+            "PATCH article as admin group": (
+                admin,
+                (ArticleViewSet, {"patch": "partial_update"}),
+                lambda: factory.patch(f"/api/articles/{article.pk}/", {"title": "t"}, format="json"),
+                {"pk": article.pk},
+            ),
+            "GET /api/me/": (
+                owner,
+                (MeView, None),
+                lambda: factory.get("/api/me/"),
+                {},
+            ),
+            "GET article comments": (
+                owner,
+                (ArticleCommentListCreateView, None),
+                lambda: factory.get(f"/api/articles/{article.pk}/comments/"),
+                {"article_id": article.pk},
+            ),
+        }
+
+        results = {}
+        for name, (user, (view_class, actions), make_request, kwargs) in scenarios.items():
+            token = str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+            results[name] = {}
+            for label, auth_class in AUTH_CLASSES.items():
+                initkwargs = {"authentication_classes": [auth_class]}
+                view = view_class.as_view(actions, **initkwargs) if actions else view_class.as_view(**initkwargs)
+                # first request warms the group cache: measure the steady state
+                for _ in range(2):
+                    request = make_request()
+                    request.META["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = view(request, **kwargs)
+                assert response.status_code < 400, (name, label, response.status_code, response.data)
+                results[name][label] = len(ctx.captured_queries)
+        return results
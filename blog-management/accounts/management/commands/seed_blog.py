@@ -71,9 +71,9 @@ class Command(BaseCommand):
         # ─────────────────────────────
         # 3) TAGS (travel flavored)
         # ─────────────────────────────
-        tag_travel, _ = Tag.objects.get_or_create(name="travel")
-        tag_europe, _ = Tag.objects.get_or_create(name="europe")
-        tag_beach, _ = Tag.objects.get_or_create(name="beach")
+        tag_travel, _ = Tag.objects.get_or_create(slug="travel", defaults={"name": "travel"})
+        tag_europe, _ = Tag.objects.get_or_create(slug="europe", defaults={"name": "europe"})
+        tag_beach, _ = Tag.objects.get_or_create(slug="beach", defaults={"name": "beach"})
 
         # ─────────────────────────────
         # 4) ARTICLES (travel + image_url)
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from common.permissions import get_group_names
 from .models import Profile
 
 User = get_user_model()
@@ -53,7 +54,7 @@ class MeSerializer(serializers.ModelSerializer):
         )
 
     def get_groups(self, obj):
-        return list(obj.groups.values_list("name", flat=True))
+        return sorted(get_group_names(obj))
 
     def update(self, instance, validated_data):
         profile_data = validated_data.pop("profile", {})
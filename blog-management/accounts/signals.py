@@ -1,8 +1,10 @@
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from common.permissions import invalidate_group_cache
 from .models import Profile
 
 
@@ -17,3 +19,25 @@ def create_profile_and_default_group(sender, instance, created, **kwargs):
     # Put new users in default group "user"
     group, _ = Group.objects.get_or_create(name="user")
     instance.groups.add(group)
+
+
+# ─────────────────────────────
+# Group-name cache (common.permissions.get_group_names)
+# ─────────────────────────────
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_user_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # group.user_set.add/remove(...) lists the users; clear() does not
+        invalidate_group_cache(pk_set if action != "post_clear" else None)
+    else:
+        instance.__dict__.pop("_group_names", None)
+        invalidate_group_cache([instance.pk])
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_groups(sender, instance, **kwargs):
+    invalidate_group_cache()
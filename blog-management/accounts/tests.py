@@ -1,3 +1,167 @@
-from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.models import ThrottleCounter
+from common.permissions import get_group_names, user_in_group
+from common.throttling import ScopedWriteRateThrottle
+from posts.models import Article
+from posts.tests import without_throttling
+
+
+@without_throttling
+class GroupCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("member", password="pass12345")
+        self.admin = Group.objects.create(name="admin")
+
+    def names(self):
+        # a fresh instance, as each request loads the user again
+        return get_group_names(User.objects.get(pk=self.user.pk))
+
+    def test_cached_between_requests(self):
+        self.assertEqual(self.names(), {"user"})
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(user_in_group(user, "admin"))
+            self.assertTrue(user_in_group(user, "user"))
+
+    def test_membership_changes_invalidate(self):
+        self.assertEqual(self.names(), {"user"})
+        self.user.groups.add(self.admin)
+        self.assertEqual(self.names(), {"admin", "user"})
+        self.admin.user_set.remove(self.user)
+        self.assertEqual(self.names(), {"user"})
+        self.admin.user_set.add(self.user)
+        self.assertEqual(self.names(), {"admin", "user"})
+        self.admin.user_set.clear()
+        self.assertEqual(self.names(), {"user"})
+
+    def test_group_rename_and_delete_invalidate(self):
+        self.user.groups.add(self.admin)
+        self.assertEqual(self.names(), {"admin", "user"})
+        self.admin.name = "editors"
+        self.admin.save()
+        self.assertEqual(self.names(), {"editors", "user"})
+        self.admin.delete()
+        self.assertEqual(self.names(), {"user"})
+
+    def test_admin_group_edit_takes_effect_immediately(self):
+        article = Article.objects.create(title="t", content="c", author=User.objects.create_user("owner"))
+        self.client.force_login(self.user)
+        url = f"/api/articles/{article.pk}/"
+        self.assertEqual(self.client.patch(url, {"title": "x"}, content_type="application/json").status_code, 403)
+        self.user.groups.add(self.admin)
+        self.assertEqual(self.client.patch(url, {"title": "x"}, content_type="application/json").status_code, 200)
+        self.assertEqual(self.client.get("/api/me/").json()["groups"], ["admin", "user"])
+
+
+@without_throttling
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.owner = User.objects.create_user("owner", password="pass12345")
+        self.editor = User.objects.create_user("editor", password="pass12345")
+        self.article = Article.objects.create(title="t", content="c", author=self.owner)
+
+    def obtain(self, username):
+        response = self.client.post("/api/token/", {"username": username, "password": "pass12345"})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_access_token_carries_groups_and_flags(self):
+        claims = AccessToken(self.obtain("owner")["access"])
+        self.assertEqual(claims["username"], "owner")
+        self.assertEqual(claims["groups"], ["user"])
+        self.assertFalse(claims["is_staff"])
+
+    def test_refresh_picks_up_new_groups(self):
+        tokens = self.obtain("editor")
+        self.editor.groups.add(Group.objects.create(name="admin"))
+
+        response = self.client.post("/api/token/refresh/", {"refresh": tokens["refresh"]})
+        self.assertEqual(AccessToken(response.json()["access"])["groups"], ["admin", "user"])
+
+    def test_permission_checks_do_not_load_the_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.obtain('owner')['access']}")
+        url = f"/api/articles/{self.article.pk}/comments/"
+        self.client.get(url)  # warm caches
+
+        with self.assertNumQueries(1):  # the comments themselves
+            self.client.get(url)
+
+        response = self.client.post(url, {"content": "hello"})
+        self.assertEqual(response.status_code, 201)  # real User loaded for author=
+
+    def test_group_claim_grants_admin_edit(self):
+        self.editor.groups.add(Group.objects.create(name="admin"))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.obtain('editor')['access']}")
+
+        response = self.client.patch(f"/api/articles/{self.article.pk}/", {"title": "edited"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+
+class ScopedThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["throttle"].clear()
+        User.objects.create_user("owner", password="pass12345")
+
+    def test_cached_read_costs_no_queries(self):
+        # the anon / user throttles count in the throttle cache, not the database
+        self.client.get("/api/articles/")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/articles/").status_code, 200)
+
+    def test_anon_limit_applies_to_cached_reads(self):
+        rates = {**settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], "anon": "2/minute"}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}):
+            statuses = [self.client.get("/api/articles/").status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @patch.object(ScopedWriteRateThrottle, "THROTTLE_RATES", {"token": "2/minute"})
+    def test_token_limit_and_window_reset(self):
+        def login():
+            return self.client.post("/api/token/", {"username": "owner", "password": "wrong"})
+
+        with patch.object(ScopedWriteRateThrottle, "timer", return_value=120.0):
+            self.assertEqual([login().status_code for _ in range(2)], [401, 401])
+            response = login()
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response["Retry-After"], "60")
+
+        with patch.object(ScopedWriteRateThrottle, "timer", return_value=180.0):
+            self.assertEqual(login().status_code, 401)  # next window
+
+    @patch.object(ScopedWriteRateThrottle, "THROTTLE_RATES", {"article_write": "1/minute"})
+    def test_reads_do_not_count_against_write_scopes(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username="owner"))
+        for _ in range(3):
+            self.assertEqual(client.get("/api/articles/").status_code, 200)
+
+        self.assertEqual(client.post("/api/articles/", {"title": "t", "content": "c"}).status_code, 201)
+        self.assertEqual(client.post("/api/articles/", {"title": "t", "content": "c"}).status_code, 429)
+
+    @override_settings(THROTTLE_WRITE_COUNTER="db")
+    @patch.object(ScopedWriteRateThrottle, "THROTTLE_RATES", {"register": "2/hour"})
+    def test_database_counters(self):
+        def register(i):
+            return self.client.post("/api/register/", {"username": f"new{i}", "password": "pass12345"}).status_code
+
+        with patch.object(ScopedWriteRateThrottle, "timer", return_value=7200.0):
+            self.assertEqual([register(i) for i in range(3)], [201, 201, 429])
+        self.assertEqual(ThrottleCounter.objects.get().count, 3)
+
+        ThrottleCounter.objects.update(expires_at=ThrottleCounter.objects.get().expires_at.replace(year=2000))
+        call_command("prune_throttle_counters", stdout=StringIO())
+        self.assertFalse(ThrottleCounter.objects.exists())
@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.permissions import get_group_names
+
+User = get_user_model()
+
+
+def add_user_claims(token, user):
+    """Claims ClaimsJWTAuthentication answers permission checks from."""
+    token["username"] = user.get_username()
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token["groups"] = sorted(get_group_names(user))
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @property
+    def access_token(self):
+        # access tokens minted on refresh carry the user's *current* groups
+        # and flags rather than the ones copied from the refresh token
+        access = super().access_token
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is not None:
+            add_user_claims(access, user)
+        return access
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
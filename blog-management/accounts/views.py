@@ -2,12 +2,19 @@ from django.shortcuts import render
 
 # Create your views here.
 from rest_framework import generics, permissions
+from rest_framework_simplejwt.views import TokenObtainPairView as BaseTokenObtainPairView
 from .serializers import RegisterSerializer,MeSerializer
 
 
+class TokenObtainPairView(BaseTokenObtainPairView):
+    # login attempts per client: DEFAULT_THROTTLE_RATES["token"]
+    throttle_scope = "token"
+
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "register"
 
 
 class MeView(generics.RetrieveUpdateAPIView):
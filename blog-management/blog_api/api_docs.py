@@ -22,12 +22,25 @@ def api_docs(request, format=None):
             },
             "posts": {
                 "articles": reverse("articles-list", request=request, format=format),
+                "articles (card fields, ?fields=a,b for any subset)": reverse("articles-list", request=request)
+                + "?view=compact",
                 "latest": reverse("articles-latest", request=request, format=format),
+                "export (NDJSON, ?export_format=csv)": reverse("articles-export", request=request, format=format),
+                "changes (?since=<watermark>)": reverse("articles-changes", request=request, format=format),
+                "batch (?ids=1,2,3&comments=N)": reverse("articles-batch", request=request, format=format),
+                "bulk (POST, {\"operations\": [...]})": reverse("articles-bulk", request=request, format=format),
+                "async (ASGI) list / latest / detail": "/api/async/articles/, /api/async/articles/latest/, "
+                                                      "/api/async/articles/<pk>/",
             },
             "comments": {
                 # These require an article_id or pk, so we show URL patterns:
                 "article_comments": "/api/articles/<article_id>/comments/",
                 "comment_detail": "/api/comments/<pk>/",
+                "changes (?since=<watermark>, ?article=<id>)": reverse(
+                    "comment-changes", request=request, format=format
+                ),
+                "async (ASGI) article_comments": "/api/async/articles/<article_id>/comments/",
+                "live stream (SSE, ASGI only)": "/api/async/articles/<article_id>/comments/stream/",
             },
         }
     )
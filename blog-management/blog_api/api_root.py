@@ -26,10 +26,18 @@ def api_root(request, format=None):
             "posts": {
                 "articles_list": reverse("articles-list", request=request, format=format),
                 "articles_latest": reverse("articles-latest", request=request, format=format),
+                "articles_export": reverse("articles-export", request=request, format=format),
+                "articles_changes": reverse("articles-changes", request=request, format=format),
+                "articles_batch": reverse("articles-batch", request=request, format=format),
+                "articles_bulk": reverse("articles-bulk", request=request, format=format),
                 # Example detail URL (replace 1 with a real article id)
                 "article_detail_example": reverse("articles-detail", kwargs={"pk": 1}, request=request, format=format),
+                # ASGI-native reads, same responses
+                "async_articles_list": reverse("async-articles-list", request=request),
+                "async_articles_latest": reverse("async-articles-latest", request=request),
             },
             "comments": {
+                "comments_changes": reverse("comment-changes", request=request, format=format),
                 # Example URLs (replace ids with real ones)
                 "article_comments_example": reverse(
                     "article-comments",
@@ -37,6 +45,11 @@ def api_root(request, format=None):
                     request=request,
                     format=format,
                 ),
+                "async_article_comments_example": reverse(
+                    "async-article-comments",
+                    kwargs={"article_id": 1},
+                    request=request,
+                ),
                 "comment_detail_example": reverse(
                     "comment-detail",
                     kwargs={"pk": 1},
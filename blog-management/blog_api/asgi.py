@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_api.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# live comment streams (SSE) bypass Django's handler, see comments.sse
+from comments.sse import CommentStreamRouter  # noqa: E402
+
+application = CommentStreamRouter(django_application)
@@ -65,11 +65,16 @@ INSTALLED_APPS = [
     "accounts.apps.AccountsConfig",
     "posts",
     "comments",
+    "common",
 ]
 
 MIDDLEWARE = [
+    # first, so its timings cover the rest of the stack
+    "common.middleware.PerformanceMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
+    # before anything that queries: opens the replica routing scope
+    "common.middleware.ReadYourWritesMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -124,17 +129,164 @@ if DB_ENGINE == "postgres":
             "PASSWORD": config("DB_PASSWORD"),
             "HOST": config("DB_HOST", default="localhost"),
             "PORT": config("DB_PORT", default="5432"),
+            "OPTIONS": {
+                "connect_timeout": config("DB_CONNECT_TIMEOUT", default=10, cast=int),
+            },
         }
     }
+
+    # Connection reuse. DB_POOL=True: psycopg 3 connection pool in every
+    # worker process (also the right choice under ASGI, where persistent
+    # connections are not shared between requests). Otherwise each thread
+    # keeps its connection for DB_CONN_MAX_AGE seconds (0 = close after
+    # every request, the old behaviour).
+    if config("DB_POOL", default=False, cast=bool):
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            # seconds a request waits for a free connection before failing
+            "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+            # idle connections above min_size are closed after this many seconds
+            "max_idle": config("DB_POOL_MAX_IDLE", default=300, cast=float),
+            # connections are replaced after this many seconds
+            "max_lifetime": config("DB_POOL_MAX_LIFETIME", default=1800, cast=float),
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = config("DB_CONN_MAX_AGE", default=60, cast=int)
+        # ping a reused connection before the first query of each request
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
 else:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / config("DB_NAME", default="db.sqlite3"),
+            "OPTIONS": {
+                # seconds to wait for another connection's write lock
+                "timeout": config("SQLITE_TIMEOUT", default=20, cast=int),
+                # take the write lock at BEGIN: a transaction that reads and
+                # then writes can otherwise fail with "database is locked"
+                # without waiting for `timeout`
+                "transaction_mode": "IMMEDIATE",
+                # WAL: readers don't block the writer and the writer doesn't
+                # block readers. synchronous=NORMAL is durable in WAL mode
+                # except for the last transactions on power loss.
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA mmap_size=134217728;"
+                    "PRAGMA cache_size=-20000;"
+                ),
+            },
         }
     }
 
 
+# Read replicas (optional): DB_REPLICAS is a comma-separated list of
+# host[:port] for postgres (same name/credentials as the primary) or of file
+# names for sqlite. PrimaryReplicaRouter sends posts/comments/accounts reads
+# to them; see common.routers.
+
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    (r.strip() for r in config("DB_REPLICAS", default="").split(",") if r.strip()), start=1
+):
+    alias = f"replica{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        # tests run against the primary only
+        "TEST": {"MIRROR": "default"},
+    }
+    if DB_ENGINE == "postgres":
+        host, _, port = replica.partition(":")
+        DATABASES[alias].update(HOST=host, PORT=port or DATABASES["default"]["PORT"])
+    else:
+        DATABASES[alias]["NAME"] = BASE_DIR / replica
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["common.routers.PrimaryReplicaRouter"]
+
+# after a write, the client reads from the primary for this many seconds
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=5, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# locmem is per-process: use file or db when running several workers so that
+# invalidations are seen by all of them (db needs `manage.py createcachetable`).
+
+CACHE_BACKEND = config("CACHE_BACKEND", default="locmem")  # locmem | file | db
+
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "blog-api"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "db": ("django.core.cache.backends.db.DatabaseCache", "cache_table"),
+}
+
+# Rate-limit counters (common.throttling): one atomic cache.incr() per
+# throttle and request in the "throttle" cache. redis or memcached are shared
+# by all workers (pip install redis / pymemcache); locmem counts per process,
+# so each worker allows the full rate.
+THROTTLE_CACHE_BACKEND = config("THROTTLE_CACHE_BACKEND", default="locmem")  # redis | memcached | locmem
+# The scoped write limits (login, register, comment and article writes) can
+# be counted in the database instead: exact across workers without a cache
+# server, for requests that write anyway (common.models.ThrottleCounter,
+# `manage.py prune_throttle_counters` daily).
+THROTTLE_WRITE_COUNTER = config("THROTTLE_WRITE_COUNTER", default="db")  # db | cache
+THROTTLE_CACHE_BACKENDS = {
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+    "memcached": ("django.core.cache.backends.memcached.PyMemcacheCache", "127.0.0.1:11211"),
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "blog-api-throttle"),
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": config("CACHE_LOCATION", default=CACHE_BACKENDS[CACHE_BACKEND][1]),
+        "OPTIONS": {"MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=10000, cast=int)},
+    },
+}
+CACHES["throttle"] = {
+    "BACKEND": THROTTLE_CACHE_BACKENDS[THROTTLE_CACHE_BACKEND][0],
+    "LOCATION": config("THROTTLE_CACHE_LOCATION", default=THROTTLE_CACHE_BACKENDS[THROTTLE_CACHE_BACKEND][1]),
+}
+if THROTTLE_CACHE_BACKEND == "locmem":
+    # locmem evicts past MAX_ENTRIES, counters still in use included
+    CACHES["throttle"]["OPTIONS"] = {
+        "MAX_ENTRIES": config("THROTTLE_CACHE_MAX_ENTRIES", default=100000, cast=int),
+    }
+
+# Versioned response cache for public article reads (common.cache)
+RESPONSE_CACHE_ENABLED = config("RESPONSE_CACHE_ENABLED", default=True, cast=bool)
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", default=300, cast=int)
+RESPONSE_CACHE_ALIAS = "default"
+
+THROTTLE_CACHE_ALIAS = "throttle"
+
+# Live comment streams (comments.events): LocalBroker only sees the writes of
+# its own process; DatabasePollingBroker polls the comments table so every
+# worker sees every write
+COMMENT_EVENTS_BROKER = config("COMMENT_EVENTS_BROKER", default="comments.events.LocalBroker")
+COMMENT_EVENTS_POLL_INTERVAL = config("COMMENT_EVENTS_POLL_INTERVAL", default=2, cast=float)
+COMMENT_EVENTS_HEARTBEAT = config("COMMENT_EVENTS_HEARTBEAT", default=15, cast=float)
+
+# Incremental sync (common.sync): how far `?since=` is moved back to catch
+# late commits, how long deletions are remembered (prune_tombstones), and
+# how many changed rows one response carries (the rest via `has_more`)
+SYNC_SAFETY_MARGIN_SECONDS = config("SYNC_SAFETY_MARGIN_SECONDS", default=10, cast=int)
+SYNC_TOMBSTONE_RETENTION_DAYS = config("SYNC_TOMBSTONE_RETENTION_DAYS", default=30, cast=int)
+SYNC_PAGE_SIZE = config("SYNC_PAGE_SIZE", default=1000, cast=int)
+
+# Request instrumentation (common.middleware.PerformanceMiddleware): queries
+# slower than SLOW_QUERY_MS are logged with their view, responses carry
+# Server-Timing, and GET /metrics requires this bearer token (without one it
+# is only served with DEBUG on)
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=200, cast=float)
+SERVER_TIMING_ENABLED = config("SERVER_TIMING_ENABLED", default=True, cast=bool)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -176,8 +328,20 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 
 REST_FRAMEWORK = {
+    # orjson-backed when installed, DRF's stdlib json otherwise (common.renderers)
+    "DEFAULT_RENDERER_CLASSES": (
+        "common.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "common.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication that builds request.user from token claims
+        "accounts.authentication.ClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
 
     ),
@@ -201,14 +365,21 @@ REST_FRAMEWORK = {
     # Nice quality-of-life: predictable ordering
     "DEFAULT_ORDERING": ("-published_at",),
 
-    # Prevent brute force login/token abuse
+    # Prevent brute force login/token abuse. Counted in the shared
+    # "throttle" cache; views with a `throttle_scope` also get that scope's
+    # limit on their writes (POST/PUT/PATCH/DELETE)
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "common.throttling.AnonRateThrottle",
+        "common.throttling.UserRateThrottle",
+        "common.throttling.ScopedWriteRateThrottle",
     ),
     "DEFAULT_THROTTLE_RATES": {
-        "anon": "60/minute",
-        "user": "300/minute",
+        "anon": config("THROTTLE_ANON_RATE", default="60/minute"),
+        "user": config("THROTTLE_USER_RATE", default="300/minute"),
+        "token": config("THROTTLE_TOKEN_RATE", default="10/minute"),
+        "register": config("THROTTLE_REGISTER_RATE", default="5/hour"),
+        "comment_create": config("THROTTLE_COMMENT_CREATE_RATE", default="10/minute"),
+        "article_write": config("THROTTLE_ARTICLE_WRITE_RATE", default="30/minute"),
     },
 }
 
@@ -217,6 +388,9 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    # access tokens carry username, is_staff/is_superuser and group names
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.tokens.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.tokens.ClaimsTokenRefreshSerializer",
 }
 
 
@@ -16,8 +16,10 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
+from accounts.views import TokenObtainPairView
 from blog_api.api_root import api_root
+from common.metrics import metrics_view
 from .api_docs import api_docs
 
 
@@ -25,6 +27,9 @@ from .api_docs import api_docs
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    # Prometheus scrape target (common.metrics)
+    path("metrics", metrics_view, name="metrics"),
+
     # API Root (Browsable index)
     path("api/", api_root, name="api-root"),
 
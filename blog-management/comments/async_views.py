@@ -0,0 +1,29 @@
+"""
+Async (ASGI-native) version of the comment thread read:
+
+    GET /api/async/articles/<article_id>/comments/   ?pagination=cursor (CommentCursorPagination)
+
+Responses match ArticleCommentListCreateView's GET.
+"""
+from common.async_views import async_api_view, render
+from common.pagination import CommentCursorPagination, select_paginator
+from .models import Comment
+from .serializers import CommentSerializer
+
+PAGINATION_MODES = {
+    "cursor": CommentCursorPagination,
+}
+
+
+@async_api_view
+async def article_comments(request, article_id):
+    queryset = Comment.objects.filter(article_id=article_id).select_related("author")
+
+    paginator = select_paginator(request, PAGINATION_MODES)
+    if paginator is not None:
+        page = await paginator.apaginate_queryset(queryset, request)
+        data = CommentSerializer(page, many=True, context={"request": request}).data
+        return render(paginator.get_paginated_response(data).data)
+
+    comments = [comment async for comment in queryset.aiterator()]
+    return render(CommentSerializer(comments, many=True, context={"request": request}).data)
@@ -0,0 +1,172 @@
+"""
+Live comment events for the SSE stream (comments.sse).
+
+comments.signals reports every saved / deleted comment to the broker set in
+settings.COMMENT_EVENTS_BROKER, after the transaction commits. Each open
+stream is a Subscription: an asyncio queue on the ASGI event loop.
+
+- LocalBroker: in-process fan-out. Only sees the writes of its own process,
+  so it suits runserver and single-worker deployments.
+- DatabasePollingBroker: fan-out across workers. The database is the bus:
+  one task per process polls updated_at and the tombstones (see
+  common.sync) for the articles that currently have listeners.
+
+Events are (kind, data) with kind "created", "updated" or "deleted" and data
+the comment as CommentSerializer renders it ({"id": ...} for deletions).
+"""
+import asyncio
+import logging
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Comment, CommentTombstone
+from .serializers import CommentSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    # a client that stops reading does not grow the queue forever: past
+    # this many pending events the stream is told to reload instead
+    max_pending = 100
+
+    def __init__(self, article_id):
+        self.article_id = article_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.max_pending)
+        self.overflowed = False
+
+    def put(self, event):
+        """Queue `event`; safe to call from any thread."""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """The next event, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    def __init__(self):
+        self._subscribers = {}  # article id -> set of Subscription
+        self._lock = threading.Lock()
+
+    def subscribe(self, article_id):
+        subscription = Subscription(article_id)
+        with self._lock:
+            self._subscribers.setdefault(article_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.article_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.article_id, None)
+
+    def wants(self, article_id):
+        """Whether publish() would reach anyone (skips serializing for nobody)."""
+        return article_id in self._subscribers
+
+    def publish(self, article_id, kind, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(article_id, ()))
+        for subscription in subscribers:
+            subscription.put((kind, data))
+
+
+class DatabasePollingBroker(LocalBroker):
+    def __init__(self):
+        super().__init__()
+        self._task = None
+
+    def subscribe(self, article_id):
+        subscription = super().subscribe(article_id)
+        if self._task is None or self._task.done():
+            self._task = subscription.loop.create_task(self._poll())
+        return subscription
+
+    def wants(self, article_id):
+        # writes are picked up by _poll(), whichever process made them
+        return False
+
+    async def _poll(self):
+        started = cursor = timezone.now()
+        # what was last reported per row, to skip re-reads inside the safety margin
+        seen = {}
+        while self._subscribers:
+            await asyncio.sleep(settings.COMMENT_EVENTS_POLL_INTERVAL)
+            since = max(cursor - timedelta(seconds=settings.SYNC_SAFETY_MARGIN_SECONDS), started)
+            try:
+                cursor = timezone.now()
+                changes = await sync_to_async(self._changes)(list(self._subscribers), since)
+                for article_id, kind, data, key, stamp in changes:
+                    if seen.get(key) == stamp:
+                        continue
+                    if kind == "created" and key in seen:
+                        kind = "updated"
+                    seen[key] = stamp
+                    self.publish(article_id, kind, data)
+            except Exception:
+                logger.exception("Polling comment events failed")
+            seen = {key: stamp for key, stamp in seen.items() if stamp >= since}
+
+    def _changes(self, article_ids, since):
+        # runs in the process's shared sync thread, outside any request
+        close_old_connections()
+        changes = []
+        comments = Comment.objects.filter(article_id__in=article_ids, updated_at__gte=since)
+        for comment in comments.select_related("author").order_by("updated_at", "id"):
+            kind = "created" if comment.created_at >= since else "updated"
+            changes.append(
+                (comment.article_id, kind, comment_data(comment), ("saved", comment.pk), comment.updated_at)
+            )
+
+        tombstones = CommentTombstone.objects.filter(article_id__in=article_ids, deleted_at__gte=since)
+        for tombstone in tombstones.order_by("deleted_at"):
+            changes.append((
+                tombstone.article_id, "deleted", {"id": tombstone.comment_id},
+                ("deleted", tombstone.comment_id), tombstone.deleted_at,
+            ))
+        return changes
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.COMMENT_EVENTS_BROKER)()
+    return _broker
+
+
+def comment_data(comment):
+    return dict(CommentSerializer(comment).data)
+
+
+def publish_comment(kind, comment, using=None):
+    """Report a saved / deleted comment to live streams once the write commits."""
+    broker = get_broker()
+    article_id = comment.article_id
+    if not broker.wants(article_id):
+        return
+    data = {"id": comment.pk} if kind == "deleted" else comment_data(comment)
+    transaction.on_commit(lambda: broker.publish(article_id, kind, data), using=using)
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+from common.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY on PostgreSQL cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('comments', '0001_initial'),
+        ('posts', '0006_article_comment_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['article', 'created_at', 'id'], name='comment_article_created_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+from common.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY on PostgreSQL cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('comments', '0003_comment_updated_at_tombstone'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['updated_at', 'id'], name='comment_updated_idx'),
+        ),
+    ]
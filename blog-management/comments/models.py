@@ -1,10 +1,23 @@
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 
 # Create your models here.
 from django.contrib.auth.models import User
 from posts.models import Article
 
 
+class CommentQuerySet(models.QuerySet):
+    def latest_per_article(self, count):
+        """The `count` newest comments of every article, in one query (ROW_NUMBER() window)."""
+        rank = Window(
+            RowNumber(),
+            partition_by=F("article_id"),
+            order_by=(F("created_at").desc(), F("id").desc()),
+        )
+        return self.annotate(thread_rank=rank).filter(thread_rank__lte=count)
+
+
 class Comment(models.Model):
     article = models.ForeignKey(
         Article, on_delete=models.CASCADE, related_name="comments"
@@ -14,9 +27,29 @@ class Comment(models.Model):
     )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # drives GET comments/changes/
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # per-article thread in display order; also serves the keyset cursor
+            models.Index(fields=["article", "created_at", "id"], name="comment_article_created_idx"),
+            # comments/changes/?since=
+            models.Index(fields=["updated_at", "id"], name="comment_updated_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username}"
+
+
+class CommentTombstone(models.Model):
+    """A deleted comment, kept for SYNC_TOMBSTONE_RETENTION_DAYS (`manage.py prune_tombstones`)."""
+    comment_id = models.BigIntegerField()
+    article_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Deleted comment {self.comment_id}"
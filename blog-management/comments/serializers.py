@@ -1,10 +1,23 @@
 from rest_framework import serializers
+
+from common.serializers import ValuesReadMixin
 from .models import Comment
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ValuesReadMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.username", read_only=True)
 
+    # fast read path (common.serializers.ValuesReadMixin)
+    values_sources = {"author_name": "author__username"}
+
     class Meta:
         model = Comment
         fields = ("id", "content", "author_name", "created_at")
+
+
+class CommentChangeSerializer(CommentSerializer):
+    # comments/changes/ spans threads
+    article_id = serializers.IntegerField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = ("id", "article_id", "content", "author_name", "created_at")
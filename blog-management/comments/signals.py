@@ -0,0 +1,77 @@
+from django.db.models import F, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from posts.models import Article
+from . import events
+from .models import Comment, CommentTombstone
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if not created:
+        return
+    Article.objects.filter(pk=instance.article_id).update(
+        comment_count=F("comment_count") + 1,
+        last_comment_at=instance.created_at,
+        updated_at=timezone.now(),
+    )
+
+
+def _parent_deleted(origin):
+    # the delete started from articles: every comment in the cascade goes
+    # with its article, so per-comment bookkeeping on the article is wasted
+    return isinstance(origin, Article) or (isinstance(origin, QuerySet) and origin.model is Article)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    if _parent_deleted(origin):
+        return
+    latest = Comment.objects.filter(article_id=OuterRef("pk")).order_by("-created_at").values("created_at")[:1]
+    Article.objects.filter(pk=instance.article_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        last_comment_at=Subquery(latest),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def record_comment_tombstone(sender, instance, using, origin=None, **kwargs):
+    # reported as deleted by comments/changes/
+    tombstone = CommentTombstone(comment_id=instance.pk, article_id=instance.article_id)
+    if _parent_deleted(origin):
+        # written in one INSERT once the articles are gone, see below
+        if not hasattr(origin, "_comment_tombstones"):
+            origin._comment_tombstones = []
+        origin._comment_tombstones.append(tombstone)
+        return
+    tombstone.save(using=using)
+
+
+@receiver(post_delete, sender=Article)
+def record_cascaded_comment_tombstones(sender, instance, using, origin=None, **kwargs):
+    # the collector deletes comments before their articles
+    tombstones = getattr(origin, "_comment_tombstones", None)
+    if tombstones:
+        CommentTombstone.objects.using(using).bulk_create(tombstones)
+        tombstones.clear()
+
+
+# ─────────────────────────────
+# Live streams (comments.events)
+# ─────────────────────────────
+
+@receiver(post_save, sender=Comment)
+def publish_saved_comment(sender, instance, created, using, **kwargs):
+    events.publish_comment("created" if created else "updated", instance, using)
+
+
+@receiver(post_delete, sender=Comment)
+def publish_deleted_comment(sender, instance, using, origin=None, **kwargs):
+    # the article (and its stream) is going away with all of its comments
+    if _parent_deleted(origin):
+        return
+    events.publish_comment("deleted", instance, using)
@@ -0,0 +1,138 @@
+"""
+Live comment thread as Server-Sent Events (ASGI only):
+
+    GET /api/async/articles/<article_id>/comments/stream/
+
+Events: `created` / `updated` carry the comment as the thread endpoint
+renders it, `deleted` its {"id"}; `reset` means events were dropped and the
+thread should be reloaded. Comments written before connecting are not
+replayed, so load the thread first. A comment line is sent every
+COMMENT_EVENTS_HEARTBEAT seconds of silence so proxies keep the connection.
+
+blog_api.asgi routes this path here, in front of Django: Django's ASGI
+handler gives every request its own sync thread (and so its own database
+connection) until the response ends, which for a stream is never. Here an
+open stream is a coroutine and a queue (comments.events), and the few
+database reads share one thread per process. Nothing of the Django stack
+runs for it: the stream is public and read-only, and host validation and
+CORS are applied here from the same settings.
+"""
+import asyncio
+import re
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+
+from common.renderers import FastJSONRenderer
+from posts.models import Article
+from . import events
+
+STREAM_PATH = re.compile(r"^/api/async/articles/(?P<article_id>\d+)/comments/stream/$")
+
+
+class CommentStreamRouter:
+    """ASGI app: comment streams are served here, everything else by `app` (Django)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            match = STREAM_PATH.match(scope["path"])
+            if match:
+                return await comment_stream(scope, receive, send, int(match["article_id"]))
+        return await self.app(scope, receive, send)
+
+
+def _article_exists(article_id):
+    # outside Django's request cycle: drop a broken / expired connection first
+    close_old_connections()
+    return Article.objects.filter(pk=article_id).exists()
+
+
+def _sse(kind, data):
+    return b"event: " + kind.encode() + b"\ndata: " + FastJSONRenderer().render(data) + b"\n\n"
+
+
+def _cors_headers(request):
+    origin = request.headers.get("Origin")
+    if not origin or origin not in settings.CORS_ALLOWED_ORIGINS:
+        return []
+    headers = [(b"access-control-allow-origin", origin.encode()), (b"vary", b"Origin")]
+    if settings.CORS_ALLOW_CREDENTIALS:
+        headers.append((b"access-control-allow-credentials", b"true"))
+    return headers
+
+
+async def _respond(send, status, data, headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), *headers],
+    })
+    await send({"type": "http.response.body", "body": FastJSONRenderer().render(data)})
+
+
+async def _disconnected(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _send_events(send, subscription):
+    heartbeat = settings.COMMENT_EVENTS_HEARTBEAT
+    while True:
+        event = await subscription.get(timeout=heartbeat)
+        if subscription.overflowed:
+            await send({"type": "http.response.body", "body": _sse("reset", {})})
+            break
+        body = b": keepalive\n\n" if event is None else _sse(*event)
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+
+async def comment_stream(scope, receive, send, article_id):
+    request = ASGIRequest(scope, BytesIO())
+    try:
+        request.get_host()
+    except DisallowedHost:
+        return await _respond(send, 400, {"detail": "Invalid host."})
+    cors = _cors_headers(request)
+    if request.method not in ("GET", "HEAD"):
+        return await _respond(
+            send, 405, {"detail": f'Method "{request.method}" not allowed.'}, [(b"allow", b"GET, HEAD"), *cors]
+        )
+    if not await sync_to_async(_article_exists)(article_id):
+        return await _respond(send, 404, {"detail": "No Article matches the given query."}, cors)
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),  # nginx: pass events through unbuffered
+            *cors,
+        ],
+    })
+    if request.method == "HEAD":
+        return await send({"type": "http.response.body"})
+
+    broker = events.get_broker()
+    subscription = broker.subscribe(article_id)
+    tasks = [
+        asyncio.ensure_future(_send_events(send, subscription)),
+        asyncio.ensure_future(_disconnected(receive)),
+    ]
+    try:
+        # reconnect delay for EventSource
+        await send({"type": "http.response.body", "body": b"retry: 3000\n\n", "more_body": True})
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        broker.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+        # a send() to a client that is gone fails: nothing left to report
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,3 +1,231 @@
+import asyncio
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from posts.models import Article
+from posts.tests import ROW_COUNTS, cursor_token, make_articles, without_throttling
+from . import events
+from .models import Comment, CommentTombstone
+from .sse import CommentStreamRouter
+
+
+@without_throttling
+class CommentQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_article_comments(self):
+        article = make_articles(1)[0]
+        for count in ROW_COUNTS:
+            with self.subTest(rows=count):
+                Comment.objects.all().delete()
+                Comment.objects.bulk_create(
+                    [Comment(article=article, author=article.author, content=f"c{i}") for i in range(count)]
+                )
+
+                with self.assertNumQueries(1):
+                    response = self.client.get(f"/api/articles/{article.pk}/comments/")
+                self.assertEqual(len(response.json()), count)
+
+
+@without_throttling
+class CommentCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.article = make_articles(1)[0]
+        self.client.force_login(self.article.author)
+        self.url = f"/api/articles/{self.article.pk}/comments/"
+
+    def stats(self):
+        article = self.client.get(f"/api/articles/{self.article.pk}/").json()
+        return article["comment_count"], article["last_comment_at"]
+
+    def test_maintained_on_create_and_delete(self):
+        ids = [self.client.post(self.url, {"content": f"c{i}"}).json()["id"] for i in range(3)]
+        count, last = self.stats()
+        self.assertEqual(count, 3)
+        self.assertEqual(last, self.client.get(self.url).json()[-1]["created_at"])
+
+        self.client.delete(f"/api/comments/{ids[-1]}/")
+        self.assertEqual(self.stats(), (2, self.client.get(self.url).json()[-1]["created_at"]))
+        for pk in ids[:-1]:
+            self.client.delete(f"/api/comments/{pk}/")
+        self.assertEqual(self.stats(), (0, None))
+
+    def test_read_only(self):
+        self.client.patch(
+            f"/api/articles/{self.article.pk}/", {"comment_count": 50}, content_type="application/json"
+        )
+        self.assertEqual(self.stats(), (0, None))
+
+    def test_reconcile_command(self):
+        Comment.objects.bulk_create(
+            [Comment(article=self.article, author=self.article.author, content=f"c{i}") for i in range(4)]
+        )
+        other = Article.objects.create(title="other", content="c", author=self.article.author)
+        Article.objects.filter(pk=other.pk).update(comment_count=7)
+        self.assertEqual(self.stats(), (0, None))
+
+        out = StringIO()
+        call_command("reconcile_comment_counts", stdout=out)
+        self.assertIn("Reconciled 2 article(s)", out.getvalue())
+        self.assertEqual(self.stats()[0], 4)
+        self.assertEqual(Article.objects.get(pk=other.pk).comment_count, 0)
+
+        call_command("reconcile_comment_counts", stdout=out)
+        self.assertIn("Reconciled 0 article(s)", out.getvalue())
+
+    def test_article_delete_cost_does_not_grow_with_comments(self):
+        author = self.article.author
+        queries, invalidations, published = {}, {}, {}
+        for count in (1, 50):
+            article = Article.objects.create(title="doomed", content="c", author=author)
+            Comment.objects.bulk_create([Comment(article=article, author=author, content="c") for _ in range(count)])
+            with (
+                CaptureQueriesContext(connection) as ctx,
+                patch("posts.signals.invalidate_articles") as invalidate,
+                patch("comments.signals.events.publish_comment") as publish,
+            ):
+                article.delete()
+            queries[count] = len(ctx.captured_queries)
+            invalidations[count] = invalidate.call_count
+            published[count] = publish.call_count
+
+        self.assertEqual(queries[1], queries[50])
+        self.assertEqual(invalidations[1], invalidations[50])
+        self.assertEqual(published, {1: 0, 50: 0})
+        self.assertEqual(CommentTombstone.objects.count(), 51)
+
+
+@without_throttling
+class CommentCursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.article = make_articles(1)[0]
+
+    def add_comments(self, count):
+        Comment.objects.bulk_create(
+            [Comment(article=self.article, author=self.article.author, content=f"c{i}") for i in range(count)]
+        )
+
+    def test_walk_then_poll_for_new(self):
+        self.add_comments(5)
+        url = f"/api/articles/{self.article.pk}/comments/?pagination=cursor&page_size=2"
+        seen = []
+        while True:
+            with self.assertNumQueries(1):
+                body = self.client.get(url).json()
+            seen += [c["id"] for c in body["results"]]
+            url = body["next"]
+            if not body["results"]:
+                break
+        self.assertEqual(seen, list(Comment.objects.order_by("created_at", "id").values_list("id", flat=True)))
+
+        # the last `next` link keeps working as a "newer than" poll
+        self.assertEqual(self.client.get(url).json()["next"], url)
+        self.add_comments(1)
+        body = self.client.get(url).json()
+        self.assertEqual([c["content"] for c in body["results"]], ["c0"])
+        self.assertNotEqual(body["next"], url)
+
+    def test_crafted_cursor_is_not_found(self):
+        cursor = cursor_token({"v": ["2024-01-01T00:00:00Z", "abc"], "r": 0})
+        for url in (f"/api/articles/{self.article.pk}/comments/", f"/api/async/articles/{self.article.pk}/comments/"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(f"{url}?cursor={cursor}").status_code, 404)
+
+
+@without_throttling
+class CommentChangesTests(TestCase):
+    def test_changed_and_deleted_comments(self):
+        first, second = make_articles(2)
+        kept, edited, deleted, other = Comment.objects.bulk_create(
+            [Comment(article=first, author=first.author, content=f"c{i}") for i in range(3)]
+            + [Comment(article=second, author=second.author, content="other")]
+        )
+        Comment.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        watermark = self.client.get("/api/comments/changes/").json()["watermark"]
+
+        edited.content = "edited"
+        edited.save()
+        deleted_pk = deleted.pk
+        deleted.delete()
+        other.delete()
+
+        data = self.client.get("/api/comments/changes/", {"since": watermark, "article": first.pk}).json()
+        self.assertEqual(
+            [(c["id"], c["article_id"], c["content"]) for c in data["changed"]],
+            [(edited.pk, first.pk, "edited")],
+        )
+        self.assertEqual(data["deleted"], [{"comment_id": deleted_pk, "article_id": first.pk}])
+
+        for article in ("x", "\u00b2"):
+            with self.subTest(article=article):
+                response = self.client.get("/api/comments/changes/", {"article": article})
+                self.assertEqual(response.status_code, 400)
+
+
+class CommentStreamTests(TestCase):
+    def setUp(self):
+        self.article = make_articles(1)[0]
+
+    def write_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comment.objects.create(article=self.article, author=self.article.author, content="live")
+        pk = comment.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.delete()
+        return pk
+
+    def open_stream(self, article_id, headers=()):
+        """Run the stream app; returns (task, queue of sent messages, disconnect event)."""
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": f"/api/async/articles/{article_id}/comments/stream/",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver"), *headers],
+        }
+        sent, disconnect = asyncio.Queue(), asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        task = asyncio.ensure_future(CommentStreamRouter(None)(scope, receive, sent.put))
+        return task, sent, disconnect
+
+    async def test_pushes_new_and_deleted_comments(self):
+        origin = settings.CORS_ALLOWED_ORIGINS[0]
+        task, sent, disconnect = self.open_stream(self.article.pk, [(b"origin", origin.encode())])
+        start = await sent.get()
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        self.assertIn((b"access-control-allow-origin", origin.encode()), start["headers"])
+        self.assertEqual((await sent.get())["body"], b"retry: 3000\n\n")  # subscribed
+
+        pk = await sync_to_async(self.write_and_delete)()
+        created = (await sent.get())["body"]
+        self.assertTrue(created.startswith(b"event: created\ndata: "))
+        self.assertEqual(json.loads(created.split(b"data: ")[1])["content"], "live")
+        self.assertEqual((await sent.get())["body"], b'event: deleted\ndata: {"id":%d}\n\n' % pk)
+
+        disconnect.set()
+        await task
+        self.assertFalse(events.get_broker().wants(self.article.pk))
 
-# Create your tests here.
+    async def test_unknown_article(self):
+        task, sent, _ = self.open_stream(999999)
+        await task
+        self.assertEqual((await sent.get())["status"], 404)
@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import ArticleCommentListCreateView, CommentDetailView
+from . import async_views
+from .views import ArticleCommentListCreateView, CommentChangesView, CommentDetailView
 
 urlpatterns = [
     path(
@@ -7,10 +8,21 @@ urlpatterns = [
         ArticleCommentListCreateView.as_view(),
         name="article-comments",
     ),
+    path(
+        "comments/changes/",
+        CommentChangesView.as_view(),
+        name="comment-changes",
+    ),
     path(
         "comments/<int:pk>/",
         CommentDetailView.as_view(),
         name="comment-detail",
     ),
+    # ASGI-native read (see comments.async_views)
+    path(
+        "async/articles/<int:article_id>/comments/",
+        async_views.article_comments,
+        name="async-article-comments",
+    ),
 ]
 
@@ -1,20 +1,43 @@
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
 from posts.models import Article
-from .models import Comment
-from .serializers import CommentSerializer
+from .models import Comment, CommentTombstone
+from .serializers import CommentChangeSerializer, CommentSerializer
+from common.pagination import CommentCursorPagination, SelectablePaginationMixin
 from common.permissions import IsOwnerOrAdminGroup  # ✅ reuse shared permission
+from common.sync import changes_response
 
 
-class ArticleCommentListCreateView(generics.ListCreateAPIView):
+class ArticleCommentListCreateView(SelectablePaginationMixin, generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     pagination_class = None
+    # POSTs only (common.throttling.ScopedWriteRateThrottle)
+    throttle_scope = "comment_create"
+
+    # Opt-in: ?pagination=cursor pages by (created_at, id) and its last `next`
+    # link can be polled for new comments
+    pagination_modes = {
+        "cursor": CommentCursorPagination,
+    }
 
     def get_queryset(self):
         article_id = self.kwargs["article_id"]
         return Comment.objects.filter(article_id=article_id).select_related("author")
 
+    def list(self, request, *args, **kwargs):
+        # fast read path: values() rows, same JSON (see ValuesReadMixin)
+        serializer = self.get_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = serializer.values_queryset(queryset, extra=("id", "created_at"))  # cursor values
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.fast_data(page))
+        return Response(serializer.fast_data(rows))
+
     def perform_create(self, serializer):
         article = get_object_or_404(Article, id=self.kwargs["article_id"])
         serializer.save(author=self.request.user, article=article)
@@ -35,3 +58,26 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Comment.objects.all().select_related("author", "article")
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrAdminGroup] 
+
+
+class CommentChangesView(generics.GenericAPIView):
+    """
+    GET /api/comments/changes/?since=<watermark>[&article=<id>]
+    Comments changed and deleted since the watermark (see common.sync).
+    """
+    serializer_class = CommentChangeSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        comments = Comment.objects.all()
+        deleted = CommentTombstone.objects.values("comment_id", "article_id")
+
+        article_id = request.query_params.get("article")
+        if article_id:
+            try:
+                article_id = int(article_id)
+            except ValueError:
+                raise ValidationError({"article": "Expected an article id."})
+            comments = comments.filter(article_id=article_id)
+            deleted = deleted.filter(article_id=article_id)
+        return changes_response(request, self.get_serializer(), comments, deleted)
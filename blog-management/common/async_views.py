@@ -0,0 +1,74 @@
+"""
+Helpers for the async (ASGI-native) read endpoints.
+
+DRF views are synchronous, so under an ASGI server every DRF request runs in
+a worker thread. The async endpoints are plain Django `async def` views that
+read through the async ORM (aiterator/aget/aprefetch_related_objects) and
+then run the regular DRF serializers over rows that are already fully
+loaded, so no lazy query can happen and the JSON is the same as the sync
+endpoints'.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from .renderers import FastJSONRenderer
+
+
+def render(data, status=200, headers=None):
+    """JSON response rendered like the DRF views' (default renderer)."""
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def _authenticate_and_throttle(request):
+    # same checks a DRF view runs in initial(); permissions are AllowAny for reads
+    request.user
+    waits = [
+        throttle.wait()
+        for throttle in (cls() for cls in api_settings.DEFAULT_THROTTLE_CLASSES)
+        if not throttle.allow_request(request, None)
+    ]
+    if waits:
+        raise exceptions.Throttled(max((w for w in waits if w is not None), default=None))
+
+
+def async_api_view(view):
+    """
+    Decorator for read-only async views.
+
+    The view receives a DRF Request (query_params, build_absolute_uri, so the
+    filtersets and paginators work unchanged). Authentication and throttling
+    may touch the database or cache and run in one sync_to_async call before
+    the view; API exceptions are answered with DRF's usual error bodies.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            exc = exceptions.MethodNotAllowed(request.method)
+            return render({"detail": exc.detail}, status=exc.status_code, headers={"Allow": "GET, HEAD"})
+
+        request = Request(
+            request,
+            authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+        )
+        try:
+            await sync_to_async(_authenticate_and_throttle)(request)
+            return await view(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(exc, {"request": request})
+            if response is None:
+                raise
+            headers = {k: v for k, v in response.items() if k.lower() != "content-type"}
+            return render(response.data, status=response.status_code, headers=headers)
+
+    return wrapper
@@ -0,0 +1,119 @@
+"""
+Versioned read-through response cache.
+
+Entries are never deleted on write. Every cache key embeds the current value
+of one or more version counters; writes replace those counters (see
+posts.signals), so stale entries simply stop being looked up and expire on
+their own. Versions are nanosecond timestamps rather than small integers, so
+a counter that gets evicted and recreated can never collide with an old one.
+
+Only get/set/get_many/set_many are used, which keeps this working on the
+locmem, file and database cache backends alike.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def get_versions(names):
+    """Current value of each named version counter (created on first use)."""
+    cache = get_cache()
+    versions = cache.get_many(names)
+    missing = {name: _new_version() for name in names if name not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[name] for name in names]
+
+
+def _set_new_versions(names):
+    version = _new_version()
+    get_cache().set_many({name: version for name in names}, timeout=None)
+
+
+def bump_versions(names):
+    """Invalidate everything cached under the given version counters."""
+    names = list(names)
+    if not names:
+        return
+    _set_new_versions(names)
+    if transaction.get_connection().in_atomic_block:
+        # a read between the bump above and COMMIT can still cache the old
+        # rows under the new version: bump once more when the data is visible
+        transaction.on_commit(lambda: _set_new_versions(names))
+
+
+def _replicas_may_lag(versions):
+    """
+    True while a read replica may not have caught up with the write that set
+    the newest version: a response built from it must not be cached under
+    that version (see common.routers).
+    """
+    if not getattr(settings, "DATABASE_REPLICAS", []):
+        return False
+    window = getattr(settings, "REPLICA_PIN_SECONDS", 5) * 10**9
+    return time.time_ns() - max(versions) < window
+
+
+class VersionedCacheMixin:
+    """
+    View mixin: wrap a safe action with `self.cached_response(request, build)`.
+
+    Subclasses implement `get_cache_versions()` returning the version counter
+    names the current action's output depends on. Responses carry an ETag
+    derived from those versions; a matching If-None-Match on a 200 is
+    answered with 304, without touching the database while it is cached.
+    """
+    cache_prefix = "resp"
+
+    def get_cache_versions(self):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, versions):
+        query = sorted(request.query_params.lists())
+        raw = f"{request.get_host()}{request.path}|{query}|{versions}"
+        digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+        return f"{self.cache_prefix}:{self.basename}:{self.action}:{digest}"
+
+    def cached_response(self, request, build):
+        if not getattr(settings, "RESPONSE_CACHE_ENABLED", True):
+            return build()
+
+        versions = get_versions(self.get_cache_versions())
+        key = self.get_cache_key(request, versions)
+        etag = '"%s"' % key.rsplit(":", 1)[-1]
+
+        cache = get_cache()
+        data = cache.get(key)
+        if data is None:
+            # errors (404...) are neither cached nor answered with 304
+            response = build()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            if not _replicas_may_lag(versions):
+                cache.set(key, response.data, timeout=getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+        else:
+            response = Response(data)
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            if "*" in etags or etag in etags:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response["ETag"] = etag
+        return response
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from common.models import ThrottleCounter
+
+
+class Command(BaseCommand):
+    help = "Delete the rate-limit counters of throttle windows that have ended (THROTTLE_CACHE_BACKEND=db)."
+
+    def handle(self, *args, **options):
+        deleted, _ = ThrottleCounter.objects.filter(expires_at__lt=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f"✓ Pruned {deleted} expired throttle counter(s)"))
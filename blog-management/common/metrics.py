@@ -0,0 +1,132 @@
+"""
+Request metrics recorded by common.middleware.PerformanceMiddleware and
+exported at GET /metrics in the Prometheus text format.
+
+Kept in memory, per process: with several workers a scrape only sees the
+worker that answered it, so point Prometheus at each worker (one port per
+worker) rather than at the load balancer. Counters restart with the
+process, which Prometheus' rate() already handles.
+"""
+import secrets
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; Prometheus' default buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._series = {}  # label values -> state
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            series = {values: list(state) for values, state in self._series.items()}
+        for values, state in sorted(series.items()):
+            yield from self._samples(values, state)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            state = self._series.setdefault(label_values, [0])
+            state[0] += amount
+
+    def _samples(self, values, state):
+        yield f"{self.name}{_labels(self.labels, values)} {_number(state[0])}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *label_values):
+        # per-bucket counts (the last one is +Inf), then the sum; made
+        # cumulative only when scraped
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._series.get(label_values)
+            if state is None:
+                state = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0]
+            state[index] += 1
+            state[-1] += value
+
+    def _samples(self, values, state):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), state[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else _number(bound)
+            yield f"{self.name}_bucket{_labels(self.labels, values, [('le', le)])} {cumulative}"
+        yield f"{self.name}_sum{_labels(self.labels, values)} {_number(state[-1])}"
+        yield f"{self.name}_count{_labels(self.labels, values)} {cumulative}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to build the response (streamed bodies excluded).", ("view", "method")
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per request.", ("view", "method")
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request.", ("view", "method"), QUERY_COUNT_BUCKETS
+)
+RESPONSES = Counter("http_responses_total", "Responses sent, by status code.", ("view", "method", "status"))
+SLOW_QUERIES = Counter("db_slow_queries_total", "Queries slower than SLOW_QUERY_MS.", ("view",))
+
+
+def render():
+    return "".join(f"{line}\n" for metric in REGISTRY for line in metric.collect())
+
+
+def metrics_view(request):
+    """
+    GET /metrics, with `Authorization: Bearer <METRICS_TOKEN>`. Without a
+    configured token it is only served when DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = secrets.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+    else:
+        allowed = settings.DEBUG
+    if not allowed:
+        return HttpResponse("Forbidden\n", status=403, content_type=CONTENT_TYPE)
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,162 @@
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from . import metrics
+from .routers import routing_scope
+
+logger = logging.getLogger(__name__)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Read-your-writes on top of common.routers.PrimaryReplicaRouter.
+
+    Unsafe requests (POST/PUT/PATCH/DELETE) read from the primary throughout.
+    A request that wrote sets a cookie for REPLICA_PIN_SECONDS; while it is
+    present the client's requests read from the primary too, which covers
+    the replication lag after e.g. creating an article and reloading the list.
+    """
+    sync_capable = True
+    async_capable = True
+
+    cookie_name = "db_pin"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _pinned(self, request):
+        return request.method not in SAFE_METHODS or self.cookie_name in request.COOKIES
+
+    def _finish(self, response, scope):
+        if scope.wrote and getattr(settings, "DATABASE_REPLICAS", []):
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing_scope(pinned=self._pinned(request)) as scope:
+            response = self.get_response(request)
+        return self._finish(response, scope)
+
+    async def __acall__(self, request):
+        with routing_scope(pinned=self._pinned(request)) as scope:
+            response = await self.get_response(request)
+        return self._finish(response, scope)
+
+
+def view_name(request):
+    # the URL name ("articles-list"): one series per endpoint, not per path
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "unmatched"
+
+
+METRIC_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"})
+
+
+def method_label(request):
+    # clients pick the method: anything else shares one series
+    return request.method if request.method in METRIC_METHODS else "other"
+
+
+class QueryTimer:
+    """execute_wrapper counting and timing the queries of one request."""
+
+    def __init__(self, request):
+        self.request = request
+        self.count = 0
+        self.duration = 0.0
+        self.slow = settings.SLOW_QUERY_MS / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slow:
+                view = view_name(self.request)
+                metrics.SLOW_QUERIES.inc(1, view)
+                # no params: they carry user data
+                logger.warning("Slow query (%.1f ms) in %s: %s", elapsed * 1000, view, sql)
+
+
+class PerformanceMiddleware:
+    """
+    Wall time, query count and DB time of every request: reported to the
+    client as Server-Timing (SERVER_TIMING_ENABLED) and recorded per view in
+    common.metrics (GET /metrics). Queries over SLOW_QUERY_MS are logged
+    with the view that ran them.
+
+    The cost is two perf_counter() calls per query and a few dict updates
+    per request, so it stays on. Streamed bodies are sent after the
+    response leaves here and are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _wrap_queries(self, request):
+        timer = QueryTimer(request)
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(timer))
+        return timer, stack
+
+    def _finish(self, request, response, timer, started):
+        elapsed = perf_counter() - started
+        view, method = view_name(request), method_label(request)
+        metrics.REQUEST_DURATION.observe(elapsed, view, method)
+        metrics.REQUEST_DB_DURATION.observe(timer.duration, view, method)
+        metrics.REQUEST_QUERIES.observe(timer.count, view, method)
+        metrics.RESPONSES.inc(1, view, method, str(response.status_code))
+
+        if settings.SERVER_TIMING_ENABLED:
+            timing = (
+                f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries", '
+                f"total;dur={elapsed * 1000:.1f}"
+            )
+            existing = response.get("Server-Timing")
+            response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = perf_counter()
+        timer, stack = self._wrap_queries(request)
+        with stack:
+            response = self.get_response(request)
+        return self._finish(request, response, timer, started)
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        # connections belong to threads, and the ORM runs in this request's
+        # sync thread (Django's ThreadSensitiveContext), not on the event
+        # loop: wrap the connections of that thread
+        timer, stack = await sync_to_async(self._wrap_queries)(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._finish(request, response, timer, started)
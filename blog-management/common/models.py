@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class ThrottleCounter(models.Model):
+    """
+    Requests of one client in one throttle window (common.throttling,
+    THROTTLE_CACHE_BACKEND=db). Rows are only read and bumped during their
+    window; `manage.py prune_throttle_counters` deletes them afterwards.
+    """
+    key = models.CharField(max_length=255, primary_key=True)
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
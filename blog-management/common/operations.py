@@ -0,0 +1,43 @@
+"""
+Migration operations shared by the apps.
+
+AddIndexConcurrently builds the index with CREATE INDEX CONCURRENTLY on
+PostgreSQL (and drops it with DROP INDEX CONCURRENTLY when reversed), so the
+table keeps accepting writes meanwhile, and behaves like a plain AddIndex on
+every other engine (SQLite during development). Unlike the version in
+django.contrib.postgres it can be imported without psycopg installed.
+
+CONCURRENTLY cannot run inside a transaction: migrations using these
+operations must set `atomic = False`.
+"""
+from django.db import NotSupportedError
+from django.db.migrations.operations import AddIndex
+
+
+def _concurrent_options(schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return {}
+    if connection.in_atomic_block:
+        raise NotSupportedError(
+            "Building indexes concurrently is not supported inside a transaction; "
+            "set atomic = False on the migration."
+        )
+    return {"concurrently": True}
+
+
+class AddIndexConcurrently(AddIndex):
+    def describe(self):
+        description = super().describe()
+        return f"Concurrently {description[0].lower()}{description[1:]}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, **_concurrent_options(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, **_concurrent_options(schema_editor))
+
@@ -1,6 +1,243 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class DefaultTwoPerPagePagination(PageNumberPagination):
     page_size = 2
     page_size_query_param = None
     max_page_size = 2
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination keyed on a full (unique) ordering, e.g. ("-published_at", "-id").
+
+    Unlike DRF's CursorPagination (position + offset), the cursor stores the
+    values of every ordering field of the boundary row, so each page is a
+    single indexed range query no matter how deep the client has scrolled.
+    The last ordering field must be unique (normally the primary key).
+    """
+    cursor_query_param = "cursor"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+    # keep returning a `next` link on the last page (see CommentCursorPagination)
+    poll_for_new = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._set_page(list(self._page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views: the page is read with the async ORM."""
+        return self._set_page([row async for row in self._page_queryset(queryset, request)])
+
+    def _page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        self.reverse = bool(self.cursor and self.cursor["r"])
+        ordering = self._flip(self.ordering) if self.reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            values = self._cursor_values(queryset.model, self.cursor["v"])
+            queryset = queryset.filter(self._after(values, ordering))
+        return queryset[: self.page_size + 1]
+
+    def _set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            if not self.poll_for_new:
+                return None
+            if not self.page:
+                # nothing newer yet: poll the same URL again
+                return self.request.build_absolute_uri()
+        if self.page:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        # Reached an empty page while walking backwards: restart from the top.
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            return self.encode_cursor(self.page[0], reverse=True)
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    # ── cursor encoding ──────────────────────────────────────────────
+
+    def _field_names(self):
+        return [f.lstrip("-") for f in self.ordering]
+
+    def _row_value(self, row, field):
+        if isinstance(row, dict):
+            return row[field]
+        return getattr(row, field)
+
+    @staticmethod
+    def _json_default(value):
+        # full precision: DjangoJSONEncoder truncates datetimes to milliseconds,
+        # which would make the boundary row compare unequal to itself
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    def encode_cursor(self, row, reverse):
+        values = [self._row_value(row, f) for f in self._field_names()]
+        payload = json.dumps({"v": values, "r": int(reverse)}, default=self._json_default)
+        token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+            values, reverse = payload["v"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {"v": values, "r": reverse}
+
+    def _cursor_values(self, model, values):
+        # the cursor comes from the client: each value must be valid for its field
+        fields = [model._meta.get_field(name) for name in self._field_names()]
+        try:
+            converted = [field.to_python(value) for field, value in zip(fields, values)]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in converted:
+            raise NotFound(self.invalid_cursor_message)
+        return converted
+
+    # ── keyset filtering ─────────────────────────────────────────────
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+    @staticmethod
+    def _after(values, ordering):
+        """
+        Lexicographic "strictly after `values`" predicate for `ordering`:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+
+class ArticleCursorPagination(KeysetCursorPagination):
+    # matches Article.Meta.ordering, with id as the tie-breaker
+    ordering = ("-published_at", "-id")
+    page_size = 20
+    max_page_size = 100
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """
+    Oldest first, like Comment.Meta.ordering. The last page still returns a
+    `next` link pointing after its newest comment, so clients can poll that
+    link to fetch only comments posted since.
+    """
+    ordering = ("created_at", "id")
+    page_size = 50
+    max_page_size = 200
+    poll_for_new = True
+
+
+class SelectablePaginationMixin:
+    """
+    Lets clients opt into pagination with ?pagination=<mode>.
+
+    Without the parameter the view keeps its `pagination_class` (which may be
+    None for endpoints that historically returned plain lists). A `cursor`
+    parameter implies cursor mode so that next/previous links keep working.
+    """
+    pagination_query_param = "pagination"
+    pagination_modes = {
+        "page": DefaultTwoPerPagePagination,
+    }
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            self._paginator = select_paginator(
+                self.request, self.pagination_modes, self.pagination_class, self.pagination_query_param
+            )
+        return self._paginator
+
+
+def select_paginator(request, pagination_modes, default=None, query_param="pagination"):
+    """
+    Paginator instance for ?pagination=<mode> (see SelectablePaginationMixin),
+    or `default()` / None when no known mode is requested.
+    """
+    mode = request.query_params.get(query_param)
+    if not mode and "cursor" in pagination_modes:
+        cursor_class = pagination_modes["cursor"]
+        if cursor_class.cursor_query_param in request.query_params:
+            mode = "cursor"
+
+    pagination_class = pagination_modes.get(mode, default)
+    return pagination_class() if pagination_class else None
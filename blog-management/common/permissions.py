@@ -1,12 +1,61 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from common.cache import bump_versions, get_cache, get_versions
+
+# cross-request cache of each user's group names; see invalidate_group_cache()
+GROUPS_VERSION = "auth:groups:v"
+GROUP_CACHE_TIMEOUT = 60 * 60
+
+
+def _user_groups_version(user_id):
+    return f"auth:user:{user_id}:groups:v"
+
+
+def get_group_names(user) -> frozenset:
+    """
+    Names of the groups `user` belongs to. Memoized on the user object for the
+    rest of the request and kept in the shared cache between requests, so
+    steady-state permission checks cost no queries.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+
+    # ClaimsUser (accounts.authentication): groups travel in the JWT
+    names = getattr(user, "token_groups", None)
+    if names is not None:
+        return names
+
+    names = getattr(user, "_group_names", None)
+    if names is not None:
+        return names
+
+    versions = get_versions([GROUPS_VERSION, _user_groups_version(user.pk)])
+    key = "auth:user:{}:groups:{}:{}".format(user.pk, *versions)
+    cache = get_cache()
+    names = cache.get(key)
+    if names is None:
+        names = frozenset(user.groups.values_list("name", flat=True))
+        cache.set(key, names, timeout=GROUP_CACHE_TIMEOUT)
+
+    user._group_names = names
+    return names
+
+
+def invalidate_group_cache(user_ids=None):
+    """Forget cached group names of `user_ids`, or of everybody when None."""
+    if user_ids is None:
+        bump_versions([GROUPS_VERSION])
+    else:
+        bump_versions([_user_groups_version(pk) for pk in user_ids])
+
+
 def user_in_group(user, group_name: str) -> bool:
     if not user or not user.is_authenticated:
         return False
     # superuser override is nice to keep
     if getattr(user, "is_superuser", False):
         return True
-    return user.groups.filter(name=group_name).exists()
+    return group_name in get_group_names(user)
 
 def user_in_any_group(user, group_names: list[str]) -> bool:
     return any(user_in_group(user, g) for g in group_names)
@@ -42,8 +91,9 @@ class IsOwnerOrAdminGroup(BasePermission):
         if user_in_group(request.user, "admin"):
             return True
 
-        owner = getattr(obj, self.owner_field, None)
-        return bool(owner and owner == request.user)
+        # compare ids: no need to load obj.<owner_field> or the request user row
+        owner_id = getattr(obj, f"{self.owner_field}_id", None)
+        return bool(owner_id is not None and owner_id == request.user.pk)
 
 class IsCommentOwnerOrAdminGroup(IsOwnerOrAdminGroup):
     owner_field = "author"
@@ -0,0 +1,70 @@
+"""
+JSON renderer / parser backed by orjson when it is installed.
+
+orjson serializes dicts, lists, strings and numbers in C. Everything else
+(datetimes, Decimal, lazy translation strings, querysets...) is handed to
+DRF's own JSONEncoder.default, so those values come out as with
+rest_framework.renderers.JSONRenderer. Without orjson, and for anything
+orjson cannot produce (indented output for the browsable API, ?indent=,
+integers over 64 bits, non-compact or ASCII-only settings), both classes
+behave exactly like DRF's.
+
+Floats are where the output can differ; the API has no float fields, so
+checking every payload for them is not worth its cost:
+
+- small numbers are spelled differently: orjson writes 1e-7 and 0.00003
+  where the json module writes 1e-07 and 3e-05 (the same numbers once
+  parsed);
+- NaN and ±Infinity are written as null, where DRF (STRICT_JSON) raises
+  ValueError.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    # DRF escapes these so the output is also valid JavaScript
+    _LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        # orjson only reads UTF-8 and always rejects NaN / Infinity (STRICT_JSON)
+        if orjson is None or not self.strict or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
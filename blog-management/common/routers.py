@@ -0,0 +1,88 @@
+"""
+Primary / read-replica routing (settings.DATABASE_REPLICAS, see DB_REPLICAS).
+
+Reads of the posts, comments and accounts models go to a replica; writes,
+and every read that follows a write in the same request (or command), go to
+the primary ("default"). Reads inside a transaction on the primary stay on
+it too, so read-modify-write code sees its own rows.
+
+The pin lives in a ContextVar holding a mutable scope: changes made in a
+sync_to_async thread are visible to the ASGI task that owns the request.
+ReadYourWritesMiddleware opens one scope per request and extends the pin to
+the client's next requests with a short-lived cookie.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICATED_APPS = {"posts", "comments", "accounts"}
+
+
+class RoutingScope:
+    def __init__(self, pinned=False):
+        # reads go to the primary
+        self.pinned = pinned
+        # a replicated model was written in this scope
+        self.wrote = False
+
+
+_scope = ContextVar("db_routing_scope")
+
+
+def _current_scope():
+    try:
+        return _scope.get()
+    except LookupError:
+        # outside a request (shell, management commands): one scope for the context
+        scope = RoutingScope()
+        _scope.set(scope)
+        return scope
+
+
+@contextmanager
+def routing_scope(pinned=False):
+    scope = RoutingScope(pinned)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def pin_primary():
+    """Send the remaining reads of the current request to the primary."""
+    _current_scope().pinned = True
+
+
+class PrimaryReplicaRouter:
+    def _replicas(self):
+        return getattr(settings, "DATABASE_REPLICAS", [])
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICATED_APPS:
+            return None
+        replicas = self._replicas()
+        if not replicas or _current_scope().pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        # follow relations / prefetches on the replica the instance came from
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in replicas:
+            return instance._state.db
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in REPLICATED_APPS:
+            return None
+        scope = _current_scope()
+        scope.pinned = scope.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *self._replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,24 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class _Echo:
+    """File-like object whose write() just returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows):
+    """One JSON document per line; rows are consumed lazily."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def iter_csv(rows, fieldnames):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fieldnames)
+    for row in rows:
+        yield writer.writerow([row.get(name) for name in fieldnames])
@@ -0,0 +1,121 @@
+"""
+Incremental sync: the `changes/` endpoints of articles and comments.
+
+A client loads everything once, then polls `changes/?since=<watermark>`
+with the watermark of its previous response and gets back only the rows
+whose updated_at moved, plus the ids deleted since (tombstones):
+
+    {"watermark": "...", "changed": [...], "deleted": [...], "has_more": false}
+
+Apply `changed` as upserts by id, then `deleted`. The watermark is taken
+before reading, and `since` is moved back by SYNC_SAFETY_MARGIN_SECONDS, so
+rows committed late (long transactions, clock skew between workers, replica
+lag) are picked up by the next poll; a few rows may come twice. A watermark
+older than SYNC_TOMBSTONE_RETENTION_DAYS gets 410: the deletions it would
+need have been pruned, the client has to reload everything.
+
+`changed` holds at most SYNC_PAGE_SIZE rows, in (updated_at, id) order.
+With `has_more` the watermark is a continuation: the (updated_at, id) of
+the last row, plus the time the first page was read. Pass it back as
+`since` until `has_more` is false; that last page returns the first page's
+time as the watermark, so the next poll re-reads whatever changed while
+paging. `deleted` comes with the first page only: rows deleted later are
+gone from the following pages and reported by the next poll.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+
+class WatermarkExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "This watermark is too old; reload everything and sync from the new watermark."
+    default_code = "watermark_expired"
+
+
+def format_watermark(moment):
+    # no "+00:00": a bare "+" in a query string reads as a space
+    return moment.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _parse_watermark(raw):
+    try:
+        moment = parse_datetime(raw)
+    except ValueError:
+        moment = None
+    if moment is None or timezone.is_naive(moment):
+        raise ValidationError({"since": "Pass the `watermark` of a previous response."})
+    return moment
+
+
+def parse_since(request):
+    """
+    `?since=` as (cutoff, continuation): the oldest updated_at / deleted_at
+    to report, or None when the client did not send one (full load); and
+    (started, updated_at, id) when it is a continuation watermark.
+    """
+    raw = request.query_params.get("since")
+    if not raw:
+        return None, None
+
+    parts = raw.split(",")
+    if len(parts) == 3:
+        started, updated_at = _parse_watermark(parts[0]), _parse_watermark(parts[1])
+        try:
+            last_id = int(parts[2])
+        except ValueError:
+            raise ValidationError({"since": "Pass the `watermark` of a previous response."})
+        continuation = (started, updated_at, last_id)
+        since = started
+    elif len(parts) == 1:
+        continuation = None
+        since = _parse_watermark(raw)
+    else:
+        raise ValidationError({"since": "Pass the `watermark` of a previous response."})
+
+    if since < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+        raise WatermarkExpired()
+    return since - timedelta(seconds=settings.SYNC_SAFETY_MARGIN_SECONDS), continuation
+
+
+def changes_response(request, serializer, queryset, deleted):
+    """
+    The delta for `queryset` (rows with updated_at) and `deleted` (a
+    values()/values_list() queryset over tombstones with deleted_at), one
+    page of SYNC_PAGE_SIZE changed rows at a time.
+    """
+    watermark = timezone.now()
+    cutoff, continuation = parse_since(request)
+    if continuation is not None:
+        watermark, updated_at, last_id = continuation
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id))
+        deleted = []
+    elif cutoff is None:
+        deleted = []
+    else:
+        queryset = queryset.filter(updated_at__gte=cutoff)
+        deleted = list(deleted.filter(deleted_at__gte=cutoff).order_by("deleted_at"))
+
+    page_size = settings.SYNC_PAGE_SIZE
+    rows = serializer.values_queryset(queryset.order_by("updated_at", "id"), extra=("id", "updated_at"))
+    rows = list(rows[:page_size + 1])
+    has_more = len(rows) > page_size
+    if has_more:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_since = f"{format_watermark(watermark)},{format_watermark(last['updated_at'])},{last['id']}"
+    else:
+        next_since = format_watermark(watermark)
+
+    return Response({
+        "watermark": next_since,
+        "changed": serializer.fast_data(rows),
+        "deleted": deleted,
+        "has_more": has_more,
+    })
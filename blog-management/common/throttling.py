@@ -0,0 +1,123 @@
+"""
+Fixed-window rate throttles with counters shared by all workers.
+
+DRF's throttles keep a per-client list of request timestamps in the default
+cache (locmem: one count per process) and rewrite the whole list on every
+request. These count requests per time window instead: one integer per
+client and window, incremented atomically, so concurrent workers cannot
+lose counts. The window number is part of the key, so old counters are
+never reset, only left to expire.
+
+The counters live in the "throttle" cache (THROTTLE_CACHE_BACKEND):
+cache.incr() is atomic on redis / memcached and costs no query, so reads
+served from the response cache stay query-free. locmem keeps them in
+process memory, so each worker counts on its own.
+
+The scoped write limits use the database when THROTTLE_WRITE_COUNTER is
+"db" (the default): a ThrottleCounter row per client and window, bumped
+with UPDATE ... SET count = count + 1. Exact across workers without a cache
+server, and only paid by requests that write anyway. Run `manage.py
+prune_throttle_counters` daily.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import throttling
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+
+from .models import ThrottleCounter
+
+
+class CacheCounter:
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def incr(self, key, timeout):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # first request of the window
+            self.cache.add(key, 0, timeout=timeout)
+            return self.cache.incr(key)
+
+
+class DatabaseCounter:
+    def incr(self, key, timeout):
+        counters = ThrottleCounter.objects.filter(key=key)
+        with transaction.atomic():
+            # the UPDATE locks the row until commit: the count read back is ours
+            if not counters.update(count=F("count") + 1):
+                try:
+                    with transaction.atomic():
+                        ThrottleCounter.objects.create(
+                            key=key, count=1, expires_at=timezone.now() + timedelta(seconds=timeout)
+                        )
+                    return 1
+                except IntegrityError:
+                    # another worker started the window first
+                    counters.update(count=F("count") + 1)
+            return counters.values_list("count", flat=True).get()
+
+
+class FixedWindowRateThrottle(throttling.SimpleRateThrottle):
+    @property
+    def THROTTLE_RATES(self):
+        # looked up per request rather than at import, so override_settings applies
+        return api_settings.DEFAULT_THROTTLE_RATES
+
+    @property
+    def counter(self):
+        return CacheCounter(settings.THROTTLE_CACHE_ALIAS)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_ends = (window + 1) * self.duration
+        count = self.counter.incr(f"{self.key}_{window}", timeout=self.duration)
+        return count <= self.num_requests
+
+    def wait(self):
+        return max(self.window_ends - self.now, 0)
+
+
+class AnonRateThrottle(FixedWindowRateThrottle, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(FixedWindowRateThrottle, throttling.UserRateThrottle):
+    pass
+
+
+class ScopedWriteRateThrottle(FixedWindowRateThrottle, throttling.ScopedRateThrottle):
+    """
+    Per-user (or per-IP) limit on the unsafe requests of views that set
+    `throttle_scope`; the rate is DEFAULT_THROTTLE_RATES[throttle_scope].
+    Reads of those views only count against the anon/user throttles.
+    """
+
+    @property
+    def counter(self):
+        if settings.THROTTLE_WRITE_COUNTER == "db":
+            return DatabaseCounter()
+        return super().counter
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope or request.method in SAFE_METHODS:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,70 @@
+"""
+Async (ASGI-native) versions of the article read endpoints:
+
+    GET /api/async/articles/          ?author=, ?tags__name__iexact=, ?tags__name__icontains=,
+                                      ?pagination=cursor (ArticleCursorPagination)
+    GET /api/async/articles/latest/
+    GET /api/async/articles/<id>/
+
+Responses match ArticleViewSet. ?search=, ?pagination=page, export and the
+response cache are only available on the sync endpoints.
+"""
+from django.db.models import aprefetch_related_objects
+from django.http import Http404
+from django_filters.utils import translate_validation
+
+from common.async_views import async_api_view, render
+from common.pagination import ArticleCursorPagination, select_paginator
+from .filters import ArticleFilter
+from .models import Article, ArticleQuerySet
+from .serializers import ArticleSerializer
+
+PAGINATION_MODES = {
+    "cursor": ArticleCursorPagination,
+}
+
+
+def _articles():
+    # the joins of with_related(); the tags prefetch is done with _load_related
+    return Article.objects.select_related(*ArticleQuerySet.related_select)
+
+
+async def _load_related(articles):
+    await aprefetch_related_objects(articles, *ArticleQuerySet.related_prefetch)
+    return articles
+
+
+def _serialize(request, articles, many=True):
+    return ArticleSerializer(articles, many=many, context={"request": request}).data
+
+
+@async_api_view
+async def article_list(request):
+    filterset = ArticleFilter(request.query_params, queryset=_articles(), request=request)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    queryset = filterset.qs
+
+    paginator = select_paginator(request, PAGINATION_MODES)
+    if paginator is not None:
+        page = await _load_related(await paginator.apaginate_queryset(queryset, request))
+        return render(paginator.get_paginated_response(_serialize(request, page)).data)
+
+    articles = [article async for article in queryset.aiterator()]
+    return render(_serialize(request, await _load_related(articles)))
+
+
+@async_api_view
+async def article_latest(request):
+    articles = [article async for article in _articles().order_by("-published_at")[:3]]
+    return render(_serialize(request, await _load_related(articles)))
+
+
+@async_api_view
+async def article_detail(request, pk):
+    try:
+        article = await _articles().aget(pk=pk)
+    except Article.DoesNotExist:
+        raise Http404("No Article matches the given query.")
+    await _load_related([article])
+    return render(_serialize(request, article, many=False))
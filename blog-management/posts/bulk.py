@@ -0,0 +1,189 @@
+"""
+Batched article writes for POST /api/articles/bulk/.
+
+    {"operations": [
+        {"op": "create", "data": {"title": ..., "content": ..., "tags_input": [...]}},
+        {"op": "update", "id": 12, "data": {"tags_input": ["news"]}},
+        {"op": "delete", "id": 13}
+    ]}
+
+Every operation is validated on its own (ArticleSerializer, partial for
+updates) and gets its own result, in input order:
+
+    {"index": 0, "op": "create", "status": 201, "id": 42, "article": {...}}
+    {"index": 1, "op": "update", "status": 403, "errors": {"detail": ...}}
+
+The valid ones are then written together in one transaction, with a number
+of queries that does not grow with the batch: ownership of every updated or
+deleted article in one lookup, all tags resolved at once, bulk_create /
+bulk_update for the rows, and for the tag links only those added or removed
+(one read of the current links). bulk_create and bulk_update send
+no signals, so what posts.signals would do per article (updated_at, search
+index, response cache) is done here once for the whole batch. Deletes go
+through QuerySet.delete(), which does send them (tombstones, comments).
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from common.permissions import user_in_group
+from . import search
+from .cache import invalidate_articles
+from .models import Article, Tag
+
+OPERATIONS = ("create", "update", "delete")
+
+
+class BulkOperation:
+    def __init__(self, index, raw):
+        self.index = index
+        self.raw = raw if isinstance(raw, dict) else {}
+        self.op = self.raw.get("op")
+        self.pk = self.raw.get("id")
+        self.status = None
+        self.errors = None
+        self.fields = {}
+        self.tag_names = None
+        self.article = None
+
+    def fail(self, code, errors):
+        self.status, self.errors = code, errors
+
+    @property
+    def ok(self):
+        return self.errors is None
+
+    def result(self, rendered):
+        result = {"index": self.index, "op": self.op, "status": self.status}
+        if self.pk is not None:
+            result["id"] = self.pk
+        if self.ok:
+            if self.pk in rendered:
+                result["article"] = rendered[self.pk]
+        else:
+            result["errors"] = self.errors
+        return result
+
+
+def _parse(operations):
+    seen = set()
+    for operation in operations:
+        if operation.op not in OPERATIONS:
+            operation.fail(status.HTTP_400_BAD_REQUEST, {"op": [f"Expected one of {', '.join(OPERATIONS)}."]})
+        elif operation.op == "create":
+            operation.pk = None
+        elif type(operation.pk) is not int:
+            operation.fail(status.HTTP_400_BAD_REQUEST, {"id": ["Expected an article id."]})
+        elif operation.pk in seen:
+            operation.fail(status.HTTP_400_BAD_REQUEST, {"id": ["Only one operation per article in a batch."]})
+        else:
+            seen.add(operation.pk)
+
+
+def _check_ownership(operations, user):
+    targets = [op for op in operations if op.ok and op.op != "create"]
+    if not targets:
+        return
+    # one query for the whole batch (IsOwnerOrAdminGroup, per article); the
+    # rows stay locked until the batch commits
+    owners = dict(
+        Article.objects.select_for_update()
+        .filter(pk__in=[op.pk for op in targets])
+        .values_list("pk", "author_id")
+    )
+    is_admin = user_in_group(user, "admin")
+    for operation in targets:
+        if operation.pk not in owners:
+            operation.fail(status.HTTP_404_NOT_FOUND, {"detail": "No Article matches the given query."})
+        elif not is_admin and owners[operation.pk] != user.pk:
+            operation.fail(
+                status.HTTP_403_FORBIDDEN, {"detail": "You do not have permission to perform this action."}
+            )
+
+
+def _validate(operations, serializer_class, context):
+    for operation in operations:
+        if not operation.ok or operation.op == "delete":
+            continue
+        serializer = serializer_class(
+            data=operation.raw.get("data") or {}, partial=operation.op == "update", context=context
+        )
+        if not serializer.is_valid():
+            operation.fail(status.HTTP_400_BAD_REQUEST, serializer.errors)
+            continue
+        fields = dict(serializer.validated_data)
+        raw_tags = fields.pop("tags_input", None)
+        if raw_tags is not None:
+            operation.tag_names = serializer._normalize_tags(raw_tags)
+        operation.fields = fields
+
+
+def _write(operations, user):
+    creates = [op for op in operations if op.ok and op.op == "create"]
+    updates = [op for op in operations if op.ok and op.op == "update"]
+    deletes = [op for op in operations if op.ok and op.op == "delete"]
+
+    names = {name for op in creates + updates for name in op.tag_names or ()}
+    tags = {tag.slug: tag for tag in Tag.objects.resolve(list(names))}
+
+    now = timezone.now()
+    for operation in creates:
+        operation.article = Article(author_id=user.pk, **operation.fields)
+    Article.objects.bulk_create([op.article for op in creates])
+    for operation in creates:
+        operation.pk = operation.article.pk
+
+    # bulk_update writes the same columns for every row: one call per column set
+    by_columns = {}
+    for operation in updates:
+        operation.article = Article(pk=operation.pk, updated_at=now, **operation.fields)
+        by_columns.setdefault(frozenset(operation.fields), []).append(operation.article)
+    for columns, articles in by_columns.items():
+        Article.objects.bulk_update(articles, [*columns, "updated_at"])
+    # tag-only updates still change the article
+    Article.objects.filter(pk__in=[op.pk for op in updates if not op.fields]).update(updated_at=now)
+
+    # tag links: only the difference with what the articles already have
+    retagged = [op for op in creates + updates if op.tag_names is not None]
+    wanted = {
+        (op.pk, tags[Tag.normalize(name)].pk)
+        for op in retagged
+        for name in op.tag_names
+        if Tag.normalize(name) in tags
+    }
+    Through = Article.tags.through
+    existing = {}
+    retagged_updates = [op.pk for op in retagged if op.op == "update"]
+    if retagged_updates:
+        links = Through.objects.filter(article_id__in=retagged_updates).values_list("pk", "article_id", "tag_id")
+        existing = {(article_id, tag_id): pk for pk, article_id, tag_id in links}
+    stale = [pk for link, pk in existing.items() if link not in wanted]
+    if stale:
+        Through.objects.filter(pk__in=stale).delete()
+    Through.objects.bulk_create([Through(article_id=a, tag_id=t) for a, t in wanted if (a, t) not in existing])
+
+    Article.objects.filter(pk__in=[op.pk for op in deletes]).delete()
+
+    written = [op.pk for op in creates + updates]
+    if written:
+        search.index_articles(written)
+        invalidate_articles(written)
+
+    for operation in creates:
+        operation.status = status.HTTP_201_CREATED
+    for operation in updates:
+        operation.status = status.HTTP_200_OK
+    for operation in deletes:
+        operation.status = status.HTTP_204_NO_CONTENT
+
+
+def apply_operations(raw_operations, user, serializer_class, context):
+    """Validate and write a batch; returns the BulkOperation list, in input order."""
+    operations = [BulkOperation(index, raw) for index, raw in enumerate(raw_operations)]
+    _parse(operations)
+    with transaction.atomic():
+        # select_for_update: ownership still holds when the rows are written
+        _check_ownership(operations, user)
+        _validate(operations, serializer_class, context)
+        _write(operations, user)
+    return operations
@@ -0,0 +1,20 @@
+"""
+Version counters for cached article responses (see common.cache).
+
+- ARTICLE_LIST_VERSION: every list-shaped response (list, latest)
+- article_version(pk): the detail response of one article
+"""
+from common.cache import bump_versions
+
+ARTICLE_LIST_VERSION = "articles:list:v"
+
+
+def article_version(pk):
+    return f"articles:{pk}:v"
+
+
+def invalidate_articles(article_ids, lists=True):
+    names = [article_version(pk) for pk in article_ids]
+    if lists:
+        names.append(ARTICLE_LIST_VERSION)
+    bump_versions(names)
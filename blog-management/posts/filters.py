@@ -0,0 +1,53 @@
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+
+from common.pagination import KeysetCursorPagination
+from . import search
+from .models import Article, Tag
+
+
+class ArticleSearchFilter(SearchFilter):
+    """
+    ?search=<terms>                      -> icontains across `search_fields` (default)
+    ?search=<terms>&search_mode=fulltext -> ranked full-text index (posts.search)
+
+    Falls back to the icontains behaviour when the database has no index.
+    Full-text results come in rank order, which a keyset cursor cannot
+    follow: ?pagination=cursor is refused for them (use ?pagination=page).
+    """
+    search_mode_param = "search_mode"
+
+    def filter_queryset(self, request, queryset, view):
+        if request.query_params.get(self.search_mode_param) == "fulltext":
+            terms = request.query_params.get(self.search_param, "")
+            if terms.strip() and isinstance(getattr(view, "paginator", None), KeysetCursorPagination):
+                raise ValidationError(
+                    {"pagination": "Full-text results are ordered by rank; use ?pagination=page with them."}
+                )
+            ranked = search.get_backend(queryset.db).search(queryset, terms)
+            if ranked is not None:
+                return ranked
+        return super().filter_queryset(request, queryset, view)
+
+
+class ArticleFilter(filters.FilterSet):
+    """
+    Tag filters keep their historical parameter names but are answered from
+    the indexed Tag.slug column instead of a case-insensitive scan of name.
+    """
+    author = filters.CharFilter(field_name="author__username")
+    tags__name__iexact = filters.CharFilter(method="filter_tag_exact")
+    tags__name__icontains = filters.CharFilter(method="filter_tag_contains")
+
+    class Meta:
+        model = Article
+        fields = []
+
+    def filter_tag_exact(self, queryset, name, value):
+        return queryset.filter(tags__slug=Tag.normalize(value))
+
+    def filter_tag_contains(self, queryset, name, value):
+        # semi-join: an article matching several tags is still returned once
+        links = Article.tags.through.objects.filter(tag__slug__contains=Tag.normalize(value))
+        return queryset.filter(pk__in=links.values("article_id"))
@@ -0,0 +1,42 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+
+from comments.models import Comment
+from posts.models import Article, Tag
+
+User = get_user_model()
+
+
+def seed_bench_rows(rows):
+    """
+    `rows` articles (3 tags each, over 20 authors) and `rows` comments on the
+    first one. Meant to run inside a transaction that is rolled back.
+    Returns (author ids, id of the commented article).
+    """
+    users = User.objects.bulk_create([User(username=f"bench-author-{i}") for i in range(20)])
+    tags = Tag.objects.bulk_create([Tag(name=f"bench-tag-{i}", slug=f"bench-tag-{i}") for i in range(10)])
+    articles = Article.objects.bulk_create(
+        [
+            Article(title=f"Bench article {i}", content="Lorem ipsum " * 50, author=users[i % len(users)])
+            for i in range(rows)
+        ]
+    )
+    Through = Article.tags.through
+    Through.objects.bulk_create(
+        [Through(article_id=a.pk, tag_id=tags[(a.pk + k) % len(tags)].pk) for a in articles for k in range(3)]
+    )
+    Comment.objects.bulk_create(
+        [Comment(article=articles[0], author=users[i % len(users)], content=f"comment {i}") for i in range(rows)]
+    )
+    return [u.pk for u in users], articles[0].pk
+
+
+def median_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
@@ -0,0 +1,60 @@
+"""Shared helpers for the import_articles / export_articles commands."""
+import json
+import os
+import time
+
+
+class Checkpoint:
+    """
+    Small JSON file recording how far a bulk command got, written atomically
+    after every committed batch so an interrupted run can be resumed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                self.state = json.load(fh)
+
+    def get(self, key, default=None):
+        return self.state.get(key, default)
+
+    def save(self, **state):
+        self.state.update(state)
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.state, fh)
+        os.replace(tmp, self.path)
+
+
+class Throughput:
+    """Row counters + elapsed time, formatted as rows/s."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = {}
+
+    def add(self, **counts):
+        for name, n in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total = sum(self.counts.values())
+        parts = ", ".join(f"{n} {name}" for name, n in self.counts.items()) or "0 rows"
+        return f"{parts} in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)"
+
+
+def user_record(user):
+    profile = getattr(user, "profile", None)
+    return {
+        "username": user.username,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "display_name": profile.display_name if profile else "",
+        "avatar_url": profile.avatar_url if profile else None,
+    }
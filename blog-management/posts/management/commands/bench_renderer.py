@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common import renderers
+from posts.models import Article
+from posts.serializers import ArticleSerializer
+
+from ._bench import median_time, seed_bench_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Time DRF's JSONRenderer against common.renderers.FastJSONRenderer on article list "
+        "payloads of several sizes and check both produce the same bytes. "
+        "Works on throwaway rows inside a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000, 10_000])
+        parser.add_argument("--repeat", type=int, default=7)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed: FastJSONRenderer falls back to DRF's."))
+
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        with transaction.atomic():
+            author_ids, _ = seed_bench_rows(max(options["rows"]))
+            serializer = ArticleSerializer(context=context)
+            queryset = Article.objects.filter(author_id__in=author_ids).order_by("-id")
+            payloads = {rows: serializer.fast_data(serializer.values_queryset(queryset)[:rows]) for rows in options["rows"]}
+            transaction.set_rollback(True)
+
+        drf, fast = JSONRenderer(), renderers.FastJSONRenderer()
+        self.stdout.write(f"median of {options['repeat']} runs")
+        self.stdout.write(f"{'articles':>9} {'bytes':>11} {'DRF ms':>9} {'fast ms':>9} {'speedup':>8}")
+        for rows, data in payloads.items():
+            body = drf.render(data)
+            if fast.render(data) != body:
+                raise CommandError(f"{rows} rows: FastJSONRenderer output differs from JSONRenderer's")
+            slow_time = median_time(lambda: drf.render(data), options["repeat"])
+            fast_time = median_time(lambda: fast.render(data), options["repeat"])
+            self.stdout.write(
+                f"{rows:>9} {len(body):>11} {slow_time * 1000:>9.2f} {fast_time * 1000:>9.2f} "
+                f"{slow_time / fast_time:>7.1f}x"
+            )
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from posts.models import Article
+from posts.serializers import ArticleSerializer
+
+from ._bench import median_time, seed_bench_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Time DRF serialization against the values() fast read path (ValuesReadMixin) "
+        "for articles and comments, queries included, and check both render the same JSON. "
+        "Works on throwaway rows inside a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.author_ids, self.comment_article_id = seed_bench_rows(options["rows"])
+            results = self.run(options["repeat"])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{options['rows']} rows, median of {options['repeat']} runs")
+        self.stdout.write(f"{'payload':<10} {'DRF ms':>9} {'fast ms':>9} {'speedup':>8}")
+        for name, (slow, fast) in results.items():
+            self.stdout.write(f"{name:<10} {slow * 1000:>9.1f} {fast * 1000:>9.1f} {slow / fast:>7.1f}x")
+
+    def run(self, repeat):
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        renderer = JSONRenderer()
+        articles = Article.objects.with_related().filter(author_id__in=self.author_ids)
+        comments = Comment.objects.select_related("author").filter(article_id=self.comment_article_id)
+
+        cases = {
+            "articles": (ArticleSerializer, articles),
+            "comments": (CommentSerializer, comments),
+        }
+        results = {}
+        for name, (serializer_class, queryset) in cases.items():
+            def drf():
+                return renderer.render(serializer_class(list(queryset), many=True, context=context).data)
+
+            def fast():
+                serializer = serializer_class(context=context)
+                return renderer.render(serializer.fast_data(serializer.values_queryset(queryset)))
+
+            if drf() != fast():
+                raise CommandError(f"{name}: fast path output differs from the serializer's")
+            results[name] = (median_time(drf, repeat), median_time(fast, repeat))
+        return results
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from common.pagination import ArticleCursorPagination, CommentCursorPagination, KeysetCursorPagination
+from posts.models import Article, Tag
+from posts.serializers import ArticleListSerializer, ArticleSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the EXPLAIN plan of the main article and comment endpoint queries, "
+        "using sample ids from the database, to check which indexes they use. "
+        "List endpoints are explained as they run: values() rows of the fast read path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="EXPLAIN ANALYZE (PostgreSQL only: executes the queries)",
+        )
+        parser.add_argument("--format", help="EXPLAIN output format, e.g. json (PostgreSQL only)")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        explain_options = {}
+        if options["analyze"]:
+            explain_options["analyze"] = True
+        if options["format"]:
+            explain_options["format"] = options["format"]
+
+        for label, queryset in self.queries(using):
+            self.stdout.write(self.style.MIGRATE_HEADING(f"── {label}"))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
+
+    def queries(self, using):
+        articles = Article.objects.using(using)
+        comments = Comment.objects.using(using)
+
+        # boundary values for the cursor / filter queries; any value works on an empty table
+        article = articles.order_by("-published_at", "-id").first()
+        article_id = article.pk if article else 0
+        published_at = article.published_at if article else timezone.now()
+        author = User.objects.using(using).filter(pk=article.author_id).first() if article else None
+        username = author.username if author else ""
+        tag = Tag.objects.using(using).order_by("pk").first()
+        comment = comments.filter(article_id=article_id).order_by("created_at", "id").first()
+        created_at = comment.created_at if comment else timezone.now()
+        comment_id = comment.pk if comment else 0
+
+        article_page = ArticleCursorPagination.page_size + 1
+        article_after = KeysetCursorPagination._after([published_at, article_id], ArticleCursorPagination.ordering)
+        comment_page = CommentCursorPagination.page_size + 1
+        comment_after = KeysetCursorPagination._after([created_at, comment_id], CommentCursorPagination.ordering)
+
+        # what the list views run (ValuesReadMixin.values_queryset), not model instances
+        article_rows = ArticleSerializer().values_queryset
+        compact_rows = ArticleListSerializer().values_queryset
+        comment_rows = CommentSerializer().values_queryset
+
+        return [
+            ("GET /api/articles/", article_rows(articles.all(), extra=("id", "published_at"))),
+            ("GET /api/articles/ (tags of the page)", Tag.objects.using(using).article_links([article_id])),
+            ("GET /api/articles/?view=compact", compact_rows(articles.all(), extra=("id", "published_at"))),
+            ("GET /api/articles/latest/", article_rows(articles.order_by("-published_at"))[:3]),
+            (
+                "GET /api/articles/?pagination=cursor&cursor=...",
+                article_rows(
+                    articles.order_by(*ArticleCursorPagination.ordering).filter(article_after),
+                    extra=("id", "published_at"),
+                )[:article_page],
+            ),
+            (
+                "GET /api/articles/?author=<username>",
+                article_rows(articles.filter(author__username=username), extra=("id", "published_at")),
+            ),
+            (
+                "GET /api/articles/?tags__name__iexact=<tag>",
+                article_rows(articles.filter(tags__slug=tag.slug if tag else ""), extra=("id", "published_at")),
+            ),
+            ("GET /api/articles/<id>/", articles.with_related().filter(pk=article_id)),
+            (
+                "GET /api/articles/<id>/comments/",
+                comment_rows(comments.filter(article_id=article_id), extra=("id", "created_at")),
+            ),
+            (
+                "GET /api/articles/<id>/comments/?pagination=cursor&cursor=...",
+                comment_rows(
+                    comments.filter(article_id=article_id)
+                    .order_by(*CommentCursorPagination.ordering)
+                    .filter(comment_after),
+                    extra=("id", "created_at"),
+                )[:comment_page],
+            ),
+        ]
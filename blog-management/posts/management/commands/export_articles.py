@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from comments.models import Comment
+from posts.models import Article
+
+from ._ndjson import Checkpoint, Throughput, user_record
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream articles (with author, tags and comments) as NDJSON, one article per line. "
+        "Memory stays bounded: rows are read with iterator(chunk_size=...)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="NDJSON file to write, or - for stdout")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="JSON file tracking progress; re-running with the same file resumes the export",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options["checkpoint"])
+        last_id = checkpoint.get("last_id", 0)
+        batch_size = options["batch_size"]
+
+        queryset = (
+            Article.objects.filter(pk__gt=last_id)
+            .select_related("author", "author__profile")
+            .prefetch_related(
+                "tags",
+                Prefetch("comments", queryset=Comment.objects.select_related("author", "author__profile")),
+            )
+            .order_by("pk")
+        )
+
+        if options["output"] == "-":
+            out = sys.stdout
+        else:
+            out = open(options["output"], "a" if last_id else "w", encoding="utf-8")
+            if last_id:
+                # drop anything written after the last checkpoint
+                out.truncate(checkpoint.get("offset", 0))
+                out.seek(0, os.SEEK_END)
+
+        stats = Throughput()
+        pending = 0
+        try:
+            for article in queryset.iterator(chunk_size=batch_size):
+                out.write(json.dumps(self.record(article), ensure_ascii=False, default=str) + "\n")
+                stats.add(articles=1, comments=len(article.comments.all()))
+                last_id = article.pk
+                pending += 1
+                if pending >= batch_size:
+                    self.commit(out, checkpoint, last_id)
+                    pending = 0
+                    if options["verbosity"] >= 2:
+                        self.stderr.write(stats.report())
+            self.commit(out, checkpoint, last_id)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        self.stderr.write(self.style.SUCCESS(f"✓ Exported {stats.report()}"))
+
+    def commit(self, out, checkpoint, last_id):
+        out.flush()
+        offset = out.tell() if out is not sys.stdout else None
+        checkpoint.save(last_id=last_id, offset=offset)
+
+    def record(self, article):
+        return {
+            "id": article.pk,
+            "title": article.title,
+            "content": article.content,
+            "published_at": article.published_at.isoformat(),
+            "image_url": article.image_url,
+            "author": user_record(article.author),
+            "tags": [t.name for t in article.tags.all()],
+            "comments": [
+                {
+                    "author": user_record(c.author),
+                    "content": c.content,
+                    "created_at": c.created_at.isoformat(),
+                }
+                for c in article.comments.all()
+            ],
+        }
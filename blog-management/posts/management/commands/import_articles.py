@@ -0,0 +1,203 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import Profile
+from comments.models import Comment
+from posts import search
+from posts.cache import invalidate_articles
+from posts.models import Article, Tag
+
+from ._ndjson import Checkpoint, Throughput
+
+User = get_user_model()
+
+
+def read_batches(fh, batch_size, offset=0):
+    """
+    Yield (records, end_offset) from a binary NDJSON stream, `batch_size`
+    records at a time. end_offset is the byte position after the batch, so a
+    checkpoint can resume with a seek instead of re-reading the file.
+    """
+    position = offset
+    batch = []
+    for raw in fh:
+        position += len(raw)
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            batch.append(json.loads(line))
+        except ValueError as exc:
+            raise CommandError(f"Invalid JSON at byte {position - len(raw)}: {exc}")
+        if len(batch) >= batch_size:
+            yield batch, position
+            batch = []
+    if batch:
+        yield batch, position
+
+
+def parse_timestamp(value):
+    dt = parse_datetime(value) if value else None
+    if dt is None:
+        return timezone.now()
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+class Command(BaseCommand):
+    help = (
+        "Import articles from NDJSON (the export_articles format). Users, tags, articles, "
+        "tag links and comments are written with batched bulk_create, one transaction per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="NDJSON file to read, or - for stdin")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="JSON file tracking progress; re-running with the same file resumes after the last committed batch",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = Checkpoint(options["checkpoint"])
+        offset = checkpoint.get("offset", 0)
+
+        if options["input"] == "-":
+            if offset:
+                raise CommandError("Cannot resume from a checkpoint when reading stdin.")
+            fh = sys.stdin.buffer
+        else:
+            fh = open(options["input"], "rb")
+            fh.seek(offset)
+
+        self.default_group = Group.objects.filter(name="user").first()
+        stats = Throughput()
+        try:
+            for records, end_offset in read_batches(fh, options["batch_size"], offset):
+                with transaction.atomic():
+                    counts = self.import_batch(records)
+                checkpoint.save(offset=end_offset, articles=checkpoint.get("articles", 0) + len(records))
+                stats.add(**counts)
+                if options["verbosity"] >= 2:
+                    self.stdout.write(stats.report())
+        finally:
+            if fh is not sys.stdin.buffer:
+                fh.close()
+            # bulk_create sends no signals: refresh list caches once
+            invalidate_articles([])
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Imported {stats.report()}"))
+
+    def import_batch(self, records):
+        users = self.resolve_users(records)
+
+        tag_names = {}
+        for record in records:
+            for name in record.get("tags") or []:
+                name = str(name).strip()
+                if name:
+                    tag_names.setdefault(Tag.normalize(name), name)
+        tags = {t.slug: t for t in Tag.objects.resolve(list(tag_names.values()))}
+
+        articles = [
+            Article(
+                title=record["title"],
+                content=record.get("content", ""),
+                image_url=record.get("image_url") or None,
+                author=users[record["author"]["username"]],
+                # comments.signals does not run for bulk_create
+                comment_count=len(record.get("comments") or []),
+                last_comment_at=max(
+                    (parse_timestamp(c.get("created_at")) for c in record.get("comments") or []),
+                    default=None,
+                ),
+            )
+            for record in records
+        ]
+        Article.objects.bulk_create(articles)
+        # published_at is auto_now_add: bulk_create stamps "now", restore the source value
+        for article, record in zip(articles, records):
+            article.published_at = parse_timestamp(record.get("published_at"))
+        Article.objects.bulk_update(articles, ["published_at"])
+
+        links = {
+            (article.pk, tags[Tag.normalize(str(name))].pk)
+            for article, record in zip(articles, records)
+            for name in record.get("tags") or []
+            if str(name).strip()
+        }
+        Through = Article.tags.through
+        Through.objects.bulk_create([Through(article_id=a, tag_id=t) for a, t in links])
+
+        comments = []
+        created_at = []
+        for article, record in zip(articles, records):
+            for c in record.get("comments") or []:
+                comments.append(Comment(article=article, author=users[c["author"]["username"]], content=c["content"]))
+                created_at.append(parse_timestamp(c.get("created_at")))
+        Comment.objects.bulk_create(comments)
+        for comment, value in zip(comments, created_at):
+            comment.created_at = value
+        Comment.objects.bulk_update(comments, ["created_at"])
+
+        search.index_articles([a.pk for a in articles])
+        return {"articles": len(articles), "tag_links": len(links), "comments": len(comments)}
+
+    def resolve_users(self, records):
+        """username -> User for every author in the batch, creating missing ones in bulk."""
+        wanted = {}
+        for record in records:
+            wanted.setdefault(record["author"]["username"], record["author"])
+            for c in record.get("comments") or []:
+                wanted.setdefault(c["author"]["username"], c["author"])
+
+        users = {u.username: u for u in User.objects.filter(username__in=wanted)}
+        missing = [name for name in wanted if name not in users]
+        if not missing:
+            return users
+
+        unusable = make_password(None)
+        User.objects.bulk_create(
+            [
+                User(
+                    username=name,
+                    email=wanted[name].get("email", ""),
+                    first_name=wanted[name].get("first_name", ""),
+                    last_name=wanted[name].get("last_name", ""),
+                    password=unusable,
+                )
+                for name in missing
+            ],
+            ignore_conflicts=True,
+        )
+        created = list(User.objects.filter(username__in=missing))
+        users.update({u.username: u for u in created})
+
+        # what accounts.signals does for users created one by one
+        Profile.objects.bulk_create(
+            [
+                Profile(
+                    user=u,
+                    display_name=wanted[u.username].get("display_name") or "",
+                    avatar_url=wanted[u.username].get("avatar_url") or None,
+                )
+                for u in created
+            ],
+            ignore_conflicts=True,
+        )
+        if self.default_group:
+            Membership = User.groups.through
+            Membership.objects.bulk_create(
+                [Membership(user_id=u.pk, group_id=self.default_group.pk) for u in created],
+                ignore_conflicts=True,
+            )
+        return users
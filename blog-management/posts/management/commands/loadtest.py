@@ -0,0 +1,97 @@
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = (
+    "/api/articles/",
+    "/api/async/articles/",
+    "/api/articles/latest/",
+    "/api/async/articles/latest/",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GET requests to a running server and report requests/s and latency "
+        "percentiles per path. To compare WSGI and ASGI, run it once against each, e.g. "
+        "`gunicorn blog_api.wsgi -w 4` and `uvicorn blog_api.asgi:application --workers 4`, with "
+        "RESPONSE_CACHE_ENABLED=False and THROTTLE_ANON_RATE / THROTTLE_USER_RATE raised "
+        "(e.g. 1000000/second) so both measure the same database reads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("base_url", help="e.g. http://127.0.0.1:8000")
+        parser.add_argument("--path", action="append", dest="paths", help="repeatable (default: article reads)")
+        parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+        parser.add_argument("--duration", type=float, default=10.0, help="seconds per path")
+        parser.add_argument("--header", action="append", default=[], help='"Name: value", repeatable')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["base_url"])
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise CommandError("base_url must look like http://host:port")
+        headers = dict(h.split(":", 1) for h in options["header"])
+        headers = {k.strip(): v.strip() for k, v in headers.items()}
+
+        self.stdout.write(
+            f"{'path':<40} {'requests':>9} {'errors':>7} {'req/s':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        for path in options["paths"] or DEFAULT_PATHS:
+            latencies, errors, elapsed = self.run(url, path, headers, options["concurrency"], options["duration"])
+            self.stdout.write(self.format_row(path, latencies, errors, elapsed))
+
+    def run(self, url, path, headers, concurrency, duration):
+        connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        start = time.perf_counter()
+        deadline = start + duration
+
+        def worker():
+            local, failed = [], 0
+            conn = connection_class(url.hostname, url.port, timeout=30)
+            while time.perf_counter() < deadline:
+                began = time.perf_counter()
+                try:
+                    conn.request("GET", path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status < 400
+                except (OSError, http.client.HTTPException):
+                    # keep-alive dropped or refused: reconnect
+                    conn.close()
+                    conn = connection_class(url.hostname, url.port, timeout=30)
+                    ok = False
+                if ok:
+                    local.append(time.perf_counter() - began)
+                else:
+                    failed += 1
+            conn.close()
+            with lock:
+                latencies.extend(local)
+                errors[0] += failed
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return latencies, errors[0], time.perf_counter() - start
+
+    @staticmethod
+    def format_row(path, latencies, errors, elapsed):
+        count = len(latencies)
+        if count >= 2:
+            q = statistics.quantiles(latencies, n=100)
+            p50, p95, p99 = q[49], q[94], q[98]
+        else:
+            p50 = p95 = p99 = latencies[0] if latencies else 0.0
+        top = max(latencies, default=0.0)
+        ms = [f"{v * 1000:>8.1f}" for v in (p50, p95, p99, top)]
+        return f"{path:<40} {count:>9} {errors:>7} {count / elapsed:>9.1f} " + " ".join(ms)
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from comments.models import CommentTombstone
+from posts.models import ArticleTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete article/comment tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. "
+        "Clients with an older watermark get 410 from the changes/ endpoints and reload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="override SYNC_TOMBSTONE_RETENTION_DAYS")
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else settings.SYNC_TOMBSTONE_RETENTION_DAYS
+        cutoff = timezone.now() - timedelta(days=days)
+
+        # no signals or cascades on tombstones: each is a single DELETE
+        articles, _ = ArticleTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        comments, _ = CommentTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Pruned {articles} article and {comments} comment tombstone(s) older than {days} day(s)"
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the article full-text search index (after admin edits, tag renames, restores...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        backend = get_backend(options["database"])
+        backend.install()
+        self.stdout.write(self.style.SUCCESS(f"✓ Search index rebuilt ({type(backend).__name__})"))
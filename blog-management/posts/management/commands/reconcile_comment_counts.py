@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from comments.models import Comment
+from posts.cache import invalidate_articles
+from posts.models import Article
+
+BATCH_SIZE = 1000
+
+
+def actual_comment_stats():
+    """Subquery expressions for the real count / latest comment of OuterRef("pk")."""
+    per_article = Comment.objects.filter(article_id=OuterRef("pk")).order_by().values("article_id")
+    count = Coalesce(
+        Subquery(per_article.annotate(n=Count("pk")).values("n"), output_field=IntegerField()),
+        Value(0),
+    )
+    latest = Subquery(per_article.annotate(last=Max("created_at")).values("last"))
+    return count, latest
+
+
+class Command(BaseCommand):
+    help = "Recompute Article.comment_count and last_comment_at from the comments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("article_ids", nargs="*", type=int, help="limit to these articles (default: all)")
+
+    def handle(self, *args, **options):
+        count, latest = actual_comment_stats()
+
+        articles = Article.objects.order_by()
+        if options["article_ids"]:
+            articles = articles.filter(pk__in=options["article_ids"])
+
+        # one pass to find drifted rows, so a run over a healthy table writes nothing
+        rows = articles.annotate(actual_count=count, actual_last=latest).values_list(
+            "pk", "comment_count", "last_comment_at", "actual_count", "actual_last"
+        )
+        drifted = [
+            pk
+            for pk, stored_count, stored_last, actual_count, actual_last in rows.iterator(chunk_size=2000)
+            if stored_count != actual_count or stored_last != actual_last
+        ]
+
+        for start in range(0, len(drifted), BATCH_SIZE):
+            Article.objects.filter(pk__in=drifted[start:start + BATCH_SIZE]).update(
+                comment_count=count, last_comment_at=latest, updated_at=timezone.now()
+            )
+
+        if drifted:
+            invalidate_articles(drifted)
+        self.stdout.write(self.style.SUCCESS(f"✓ Reconciled {len(drifted)} article(s)"))
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from posts.search import get_backend
+
+    get_backend(schema_editor.connection.alias, apps=apps).install()
+
+
+def uninstall_search_index(apps, schema_editor):
+    from posts.search import get_backend
+
+    get_backend(schema_editor.connection.alias, apps=apps).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_article_image_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
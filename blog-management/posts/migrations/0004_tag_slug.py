@@ -0,0 +1,63 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:37
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def merge_case_duplicates(apps, schema_editor):
+    """
+    Fill Tag.slug and fold tags that only differ by case/whitespace into the
+    oldest one, moving their article links over before deleting them.
+    """
+    Tag = apps.get_model("posts", "Tag")
+    Article = apps.get_model("posts", "Article")
+    Through = Article.tags.through
+
+    groups = defaultdict(list)
+    for tag in Tag.objects.order_by("id"):
+        groups[tag.name.strip().lower()].append(tag)
+
+    merged = False
+    keepers = []
+    for slug, tags in groups.items():
+        keeper, duplicates = tags[0], tags[1:]
+        keeper.slug = slug
+        keepers.append(keeper)
+        if not duplicates:
+            continue
+
+        merged = True
+        duplicate_ids = [t.id for t in duplicates]
+        linked = set(Through.objects.filter(tag_id=keeper.id).values_list("article_id", flat=True))
+        moved = set(
+            Through.objects.filter(tag_id__in=duplicate_ids).values_list("article_id", flat=True)
+        ) - linked
+        Through.objects.bulk_create([Through(article_id=a, tag_id=keeper.id) for a in moved])
+        Tag.objects.filter(id__in=duplicate_ids).delete()
+
+    Tag.objects.bulk_update(keepers, ["slug"], batch_size=500)
+
+    if merged:
+        from posts.search import get_backend
+
+        get_backend(schema_editor.connection.alias, apps=apps).index_articles()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='slug',
+            field=models.CharField(editable=False, max_length=50, null=True),
+        ),
+        migrations.RunPython(merge_case_duplicates, migrations.RunPython.noop),
+        # the unique index is added by 0005: PostgreSQL refuses to ALTER the
+        # table in the transaction that just deleted merged tags (their
+        # deferred foreign key checks are still pending)
+    ]
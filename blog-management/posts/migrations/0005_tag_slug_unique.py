@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_tag_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tag',
+            name='slug',
+            field=models.CharField(editable=False, max_length=50, unique=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:44
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_stats(apps, schema_editor):
+    Article = apps.get_model("posts", "Article")
+    Comment = apps.get_model("comments", "Comment")
+
+    per_article = Comment.objects.filter(article_id=OuterRef("pk")).order_by().values("article_id")
+    Article.objects.update(
+        comment_count=Coalesce(
+            Subquery(per_article.annotate(n=Count("pk")).values("n"), output_field=IntegerField()),
+            Value(0),
+        ),
+        last_comment_at=Subquery(per_article.annotate(last=Max("created_at")).values("last")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_tag_slug_unique'),
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+from common.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY on PostgreSQL cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('posts', '0006_article_comment_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='article',
+            index=models.Index(fields=['-published_at', '-id'], name='article_published_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='article',
+            index=models.Index(fields=['author', '-published_at'], name='article_author_published_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+from common.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY on PostgreSQL cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('posts', '0009_article_updated_at_tombstone'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='article',
+            index=models.Index(fields=['updated_at', 'id'], name='article_updated_idx'),
+        ),
+    ]
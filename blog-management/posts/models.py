@@ -1,16 +1,94 @@
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
 from django.contrib.auth.models import User
 
 
+class TagQuerySet(models.QuerySet):
+    def resolve(self, names):
+        """
+        Tag rows for `names` (already stripped and de-duplicated), creating the
+        missing ones. Fixed number of queries: one lookup, one bulk insert,
+        one re-read of what was inserted (ignore_conflicts returns no pks).
+
+        Matching is on Tag.slug, so "Travel" reuses an existing "travel".
+        """
+        if not names:
+            return []
+
+        slugs = {}
+        for name in names:
+            slugs.setdefault(Tag.normalize(name), name)
+        found = {t.slug: t for t in self.filter(slug__in=slugs)}
+        missing = [slug for slug in slugs if slug not in found]
+        if missing:
+            self.bulk_create([Tag(name=slugs[slug], slug=slug) for slug in missing], ignore_conflicts=True)
+            found.update({t.slug: t for t in self.filter(slug__in=missing)})
+
+        return [found[slug] for slug in slugs if slug in found]
+
+    def by_article(self, article_ids):
+        """
+        {article_id: [(tag_id, name), ...]} for the given articles, in one
+        query and in Tag.Meta.ordering (the order a `tags` prefetch returns).
+        """
+        grouped = {}
+        for article_id, tag_id, name in self.article_links(article_ids):
+            grouped.setdefault(article_id, []).append((tag_id, name))
+        return grouped
+
+    def article_links(self, article_ids):
+        """The (article_id, tag_id, name) rows by_article() reads."""
+        Through = Article.tags.through
+        return (
+            Through.objects.using(self.db)
+            .filter(article_id__in=article_ids)
+            .order_by(*(f"tag__{f}" if f[0] != "-" else f"-tag__{f[1:]}" for f in Tag._meta.ordering))
+            .values_list("article_id", "tag_id", "tag__name")
+        )
+
+
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    # case-insensitive identity of the tag ("Travel " -> "travel"); set in save(),
+    # bulk_create callers must pass it themselves
+    slug = models.CharField(max_length=50, unique=True, editable=False)
+
+    objects = TagQuerySet.as_manager()
+
+    class Meta:
+        # deterministic tag order in every response
+        ordering = ["name"]
+
+    @staticmethod
+    def normalize(name):
+        return name.strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.slug = self.normalize(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "slug"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
+class ArticleQuerySet(models.QuerySet):
+    # everything ArticleSerializer reads, in 1 query + 1 prefetch for tags
+    related_select = ("author", "author__profile")
+    related_prefetch = ("tags",)
+
+    def with_related(self):
+        return self.select_related(*self.related_select).prefetch_related(*self.related_prefetch)
+
+    def touch(self):
+        """Bump updated_at for changes that bypass save() (tags, author, counters)."""
+        return self.update(updated_at=timezone.now())
+
+
 class Article(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
@@ -18,9 +96,33 @@ class Article(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="articles")
     tags = models.ManyToManyField(Tag, blank=True, related_name="articles")
     image_url = models.URLField(blank=True, null=True)
+    # maintained by comments.signals; `manage.py reconcile_comment_counts` recomputes them
+    comment_count = models.PositiveIntegerField(default=0)
+    last_comment_at = models.DateTimeField(blank=True, null=True)
+    # any change to the article's representation; drives GET articles/changes/
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ArticleQuerySet.as_manager()
 
     class Meta:
         ordering = ["-published_at"]
+        indexes = [
+            # list / latest / cursor pages, with id as the tie-breaker
+            models.Index(fields=["-published_at", "-id"], name="article_published_idx"),
+            # ?author=<username>
+            models.Index(fields=["author", "-published_at"], name="article_author_published_idx"),
+            # articles/changes/?since=
+            models.Index(fields=["updated_at", "id"], name="article_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class ArticleTombstone(models.Model):
+    """A deleted article, kept for SYNC_TOMBSTONE_RETENTION_DAYS (`manage.py prune_tombstones`)."""
+    article_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Deleted article {self.article_id}"
@@ -0,0 +1,221 @@
+"""
+Full-text search index for articles.
+
+- PostgreSQL: side table with a weighted tsvector per article and a GIN index.
+- SQLite: FTS5 virtual table whose rowid is the article id.
+- Anything else: no index; callers fall back to the icontains SearchFilter.
+
+Documents are built in SQL straight from the article, author and tag tables,
+so indexing a batch of articles is one statement regardless of its size and
+the same code can run from migrations (pass the historical `apps`).
+"""
+import re
+
+from django.apps import apps as global_apps
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+PG_TABLE = "posts_article_search"
+PG_CONFIG = "english"
+FTS_TABLE = "posts_article_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class NullSearchBackend:
+    """No full-text index available on this database."""
+
+    def __init__(self, connection, apps=global_apps):
+        self.connection = connection
+        self.apps = apps
+
+    @property
+    def tables(self):
+        Article = self.apps.get_model("posts", "Article")
+        Tag = self.apps.get_model("posts", "Tag")
+        qn = self.connection.ops.quote_name
+        return {
+            "article": qn(Article._meta.db_table),
+            "tag": qn(Tag._meta.db_table),
+            "through": qn(Article.tags.through._meta.db_table),
+            "user": qn(Article._meta.get_field("author").related_model._meta.db_table),
+        }
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def index_articles(self, article_ids=None):
+        """(Re)index the given articles, or every article when ids is None."""
+
+    def remove_articles(self, article_ids):
+        pass
+
+    def search(self, queryset, terms):
+        """Return `queryset` filtered to matches and ordered by rank, or None."""
+        return None
+
+    def _where_ids(self, article_ids, column):
+        if article_ids is None:
+            return "", []
+        article_ids = list(article_ids)
+        if not article_ids:
+            return " WHERE 1 = 0", []
+        placeholders = ", ".join(["%s"] * len(article_ids))
+        return f" WHERE {column} IN ({placeholders})", article_ids
+
+
+class SqliteSearchBackend(NullSearchBackend):
+    # bm25 column weights: title, content, author, tags
+    weights = (10.0, 1.0, 4.0, 6.0)
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                "USING fts5(title, content, author, tags, tokenize = 'porter unicode61')"
+            )
+        self.index_articles()
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def index_articles(self, article_ids=None):
+        t = self.tables
+        where, params = self._where_ids(article_ids, "a.id")
+        with self.connection.cursor() as cursor:
+            if article_ids is None:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            else:
+                self._delete(cursor, article_ids)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content, author, tags) "
+                "SELECT a.id, a.title, a.content, "
+                "u.username || ' ' || u.first_name || ' ' || u.last_name, "
+                "COALESCE(("
+                f"  SELECT group_concat(t.name, ' ') FROM {t['through']} at "
+                f"  JOIN {t['tag']} t ON t.id = at.tag_id WHERE at.article_id = a.id"
+                "), '') "
+                f"FROM {t['article']} a JOIN {t['user']} u ON u.id = a.author_id" + where,
+                params,
+            )
+
+    def remove_articles(self, article_ids):
+        with self.connection.cursor() as cursor:
+            self._delete(cursor, article_ids)
+
+    def _delete(self, cursor, article_ids):
+        where, params = self._where_ids(article_ids, "rowid")
+        cursor.execute(f"DELETE FROM {FTS_TABLE}" + where, params)
+
+    def search(self, queryset, terms):
+        tokens = _TOKEN_RE.findall(terms)
+        if not tokens:
+            return queryset
+        # quote every token so user input can never be parsed as FTS5 syntax;
+        # trailing * keeps prefix matching close to the old icontains behaviour
+        match = " ".join('"{}"*'.format(tok.replace('"', '""')) for tok in tokens)
+        weights = ", ".join(str(w) for w in self.weights)
+        article_table = self.tables["article"]
+        return (
+            queryset.filter(
+                pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = {article_table}.id",
+                    (match,),
+                )
+            )
+            .order_by("-search_rank", "-published_at", "-id")
+        )
+
+
+class PostgresSearchBackend(NullSearchBackend):
+    def install(self):
+        t = self.tables
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+                f"  article_id bigint PRIMARY KEY REFERENCES {t['article']} (id) "
+                "     ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+                "  document tsvector NOT NULL"
+                ")"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_gin "
+                f"ON {PG_TABLE} USING gin (document)"
+            )
+        self.index_articles()
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {PG_TABLE}")
+
+    def index_articles(self, article_ids=None):
+        t = self.tables
+        where, params = self._where_ids(article_ids, "a.id")
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {PG_TABLE} (article_id, document) "
+                "SELECT a.id, "
+                f"  setweight(to_tsvector('{PG_CONFIG}', a.title), 'A') || "
+                f"  setweight(to_tsvector('{PG_CONFIG}', COALESCE(tg.names, '')), 'B') || "
+                "  setweight(to_tsvector('simple', "
+                "    u.username || ' ' || u.first_name || ' ' || u.last_name), 'B') || "
+                f"  setweight(to_tsvector('{PG_CONFIG}', a.content), 'C') "
+                f"FROM {t['article']} a JOIN {t['user']} u ON u.id = a.author_id "
+                "LEFT JOIN LATERAL ("
+                f"  SELECT string_agg(t.name, ' ') AS names FROM {t['through']} at "
+                f"  JOIN {t['tag']} t ON t.id = at.tag_id WHERE at.article_id = a.id"
+                ") tg ON TRUE" + where + " "
+                "ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document",
+                params,
+            )
+
+    def remove_articles(self, article_ids):
+        where, params = self._where_ids(article_ids, "article_id")
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {PG_TABLE}" + where, params)
+
+    def search(self, queryset, terms):
+        if not terms.strip():
+            return queryset
+        article_table = self.tables["article"]
+        query = f"websearch_to_tsquery('{PG_CONFIG}', %s)"
+        return (
+            queryset.filter(
+                pk__in=RawSQL(f"SELECT article_id FROM {PG_TABLE} WHERE document @@ {query}", (terms,))
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT ts_rank_cd(document, {query}) FROM {PG_TABLE} "
+                    f"WHERE article_id = {article_table}.id",
+                    (terms,),
+                )
+            )
+            .order_by("-search_rank", "-published_at", "-id")
+        )
+
+
+BACKENDS = {
+    "sqlite": SqliteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend(using="default", apps=global_apps):
+    connection = connections[using]
+    return BACKENDS.get(connection.vendor, NullSearchBackend)(connection, apps=apps)
+
+
+def index_articles(article_ids, using="default"):
+    get_backend(using).index_articles(article_ids)
+
+
+def remove_articles(article_ids, using="default"):
+    get_backend(using).remove_articles(article_ids)
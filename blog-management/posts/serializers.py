@@ -1,5 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers
+
+from common.serializers import SparseFieldsetsMixin, ValuesReadMixin
 from .models import Article, Tag
+from . import search
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -8,7 +12,7 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ("id", "name")
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(SparseFieldsetsMixin, ValuesReadMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.username", read_only=True)
     tags = TagSerializer(many=True, read_only=True)
 
@@ -31,13 +35,36 @@ class ArticleSerializer(serializers.ModelSerializer):
             "image_url",
             "tags",
             "tags_input",
+            "comment_count",
+            "last_comment_at",
         )
+        read_only_fields = ("comment_count", "last_comment_at")
 
     def get_author_avatar_url(self, obj):
-        try:
-            return obj.author.profile.avatar_url
-        except Exception:
+        # profile comes from select_related; None when the user has no Profile row
+        profile = getattr(obj.author, "profile", None)
+        return profile.avatar_url if profile else ""
+
+    # ── fast read path (common.serializers.ValuesReadMixin) ──────────
+
+    values_sources = {"author_name": "author__username"}
+    values_extra = {
+        # the profile id tells "no Profile row" ("") from a NULL avatar (None)
+        "author_avatar_url": ("author__profile__id", "author__profile__avatar_url"),
+        "tags": ("id",),
+    }
+
+    def fast_author_avatar_url(self, row):
+        if row["author__profile__id"] is None:
             return ""
+        return row["author__profile__avatar_url"]
+
+    def prepare_fast_rows(self, rows):
+        if "tags" in self.fields:
+            self._tags_by_article = Tag.objects.by_article([row["id"] for row in rows])
+
+    def fast_tags(self, row):
+        return [{"id": tag_id, "name": name} for tag_id, name in self._tags_by_article.get(row["id"], ())]
 
     def _normalize_tags(self, raw_tags):
         if not raw_tags:
@@ -63,6 +90,7 @@ class ArticleSerializer(serializers.ModelSerializer):
                 seen.add(key)
         return unique
 
+    @transaction.atomic
     def create(self, validated_data):
         raw_tags = validated_data.pop("tags_input", [])
         tag_names = self._normalize_tags(raw_tags)
@@ -70,12 +98,14 @@ class ArticleSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         article = Article.objects.create(author=request.user, **validated_data)
 
-        for name in tag_names:
-            tag_obj, _ = Tag.objects.get_or_create(name=name)
-            article.tags.add(tag_obj)
+        tags = Tag.objects.resolve(tag_names)
+        if tags:
+            article.tags.add(*tags)
 
+        search.index_articles([article.pk], using=article._state.db)
         return article
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         raw_tags = validated_data.pop("tags_input", None)
 
@@ -84,10 +114,27 @@ class ArticleSerializer(serializers.ModelSerializer):
         instance.save()
 
         if raw_tags is not None:
-            tag_names = self._normalize_tags(raw_tags)
-            instance.tags.clear()
-            for name in tag_names:
-                tag_obj, _ = Tag.objects.get_or_create(name=name)
-                instance.tags.add(tag_obj)
+            # set() diffs against the current links: only changed rows are written
+            instance.tags.set(Tag.objects.resolve(self._normalize_tags(raw_tags)))
 
+        search.index_articles([instance.pk], using=instance._state.db)
         return instance
+
+
+class ArticleListSerializer(ArticleSerializer):
+    """
+    Card view of an article (?view=compact on list/latest): everything the
+    list page shows, without `content`.
+    """
+
+    class Meta(ArticleSerializer.Meta):
+        fields = (
+            "id",
+            "title",
+            "published_at",
+            "author_name",
+            "author_avatar_url",
+            "image_url",
+            "tags",
+            "comment_count",
+        )
@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from comments.signals import _parent_deleted
+from . import search
+from .cache import invalidate_articles
+from .models import Article, ArticleTombstone, Tag
+
+
+@receiver(post_delete, sender=Article)
+def record_article_tombstone(sender, instance, using, **kwargs):
+    # reported as deleted by articles/changes/
+    ArticleTombstone.objects.using(using).create(article_id=instance.pk)
+
+
+# ─────────────────────────────
+# Search index
+# ─────────────────────────────
+# Indexed documents include tag names and the author's names: changing
+# those, or an article's tag links, reindexes the articles concerned
+# (ArticleSerializer indexes the article itself on create / update; bulk
+# writes bypass the signals and index the batch themselves)
+
+@receiver(post_delete, sender=Article)
+def remove_article_from_search_index(sender, instance, using, **kwargs):
+    search.remove_articles([instance.pk], using=using)
+
+
+def _reindex(article_ids, using):
+    article_ids = list(article_ids)
+    if article_ids:
+        search.index_articles(article_ids, using=using)
+
+
+@receiver(post_save, sender=Tag)
+def reindex_tag_articles(sender, instance, created, using, **kwargs):
+    if not created:
+        _reindex(instance.articles.values_list("pk", flat=True), using)
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tag_articles(sender, instance, **kwargs):
+    # the links are gone by post_delete
+    instance._indexed_article_ids = list(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def reindex_untagged_articles(sender, instance, using, **kwargs):
+    _reindex(getattr(instance, "_indexed_article_ids", ()), using)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def reindex_retagged_articles(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            _reindex([instance.pk], using)
+    # tag.articles.add/remove/clear(...)
+    elif action in ("post_add", "post_remove"):
+        _reindex(pk_set, using)
+    elif action == "pre_clear":
+        instance._indexed_article_ids = list(instance.articles.values_list("pk", flat=True))
+    elif action == "post_clear":
+        _reindex(getattr(instance, "_indexed_article_ids", ()), using)
+
+
+AUTHOR_NAME_FIELDS = ("username", "first_name", "last_name")
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_author_name_change(sender, instance, update_fields, using, **kwargs):
+    # password changes, last_login... leave the author's articles alone
+    instance._author_names_changed = False
+    if instance._state.adding or (update_fields is not None and not set(AUTHOR_NAME_FIELDS) & set(update_fields)):
+        return
+    old = sender._default_manager.using(using).filter(pk=instance.pk).values_list(*AUTHOR_NAME_FIELDS).first()
+    instance._author_names_changed = old != tuple(getattr(instance, name) for name in AUTHOR_NAME_FIELDS)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_user_articles(sender, instance, using, **kwargs):
+    if getattr(instance, "_author_names_changed", False):
+        _reindex(Article.objects.using(using).filter(author_id=instance.pk).values_list("pk", flat=True), using)
+
+
+# ─────────────────────────────
+# Response cache invalidation
+# ─────────────────────────────
+# Changes that do not go through Article.save() also bump updated_at, so
+# the article shows up in articles/changes/.
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article(sender, instance, **kwargs):
+    invalidate_articles([instance.pk])
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_article_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            Article.objects.filter(pk=instance.pk).touch()
+            invalidate_articles([instance.pk])
+        return
+
+    # tag.articles.add/remove/clear(...)
+    if action in ("post_add", "post_remove"):
+        Article.objects.filter(pk__in=pk_set).touch()
+        invalidate_articles(pk_set)
+    elif action == "pre_clear":
+        instance.articles.touch()
+        invalidate_articles(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def invalidate_tag(sender, instance, **kwargs):
+    # pre_delete: the article links are gone by post_delete
+    instance.articles.touch()
+    invalidate_articles(instance.articles.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender="comments.Comment")
+@receiver(post_delete, sender="comments.Comment")
+def invalidate_comment_article(sender, instance, origin=None, **kwargs):
+    # invalidate_article covers the comments cascaded from an article delete
+    if _parent_deleted(origin):
+        return
+    # comment_count / last_comment_at show up in list responses too
+    invalidate_articles([instance.article_id])
+
+
+@receiver(post_save, sender="accounts.Profile")
+def invalidate_author_articles(sender, instance, **kwargs):
+    # author_avatar_url is part of every article by this user
+    articles = Article.objects.filter(author_id=instance.user_id)
+    articles.touch()
+    invalidate_articles(articles.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_articles(sender, instance, **kwargs):
+    # author_name (see remember_author_name_change)
+    if not getattr(instance, "_author_names_changed", False):
+        return
+    articles = Article.objects.filter(author_id=instance.pk)
+    articles.touch()
+    invalidate_articles(articles.values_list("pk", flat=True))
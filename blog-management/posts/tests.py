@@ -1,3 +1,942 @@
-from django.test import TestCase
+import base64
+import csv
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import skipUnless
+from uuid import UUID
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from common import metrics, renderers
+from common.operations import AddIndexConcurrently
+from common.routers import PrimaryReplicaRouter, routing_scope
+from . import search
+from .models import Article, Tag
+from .serializers import ArticleListSerializer, ArticleSerializer
+
+ROW_COUNTS = (1, 100, 1000)
+
+
+def make_articles(count, authors=3, tags=3):
+    """`count` articles spread over a few authors (with profiles) and tags."""
+    users = [User.objects.create_user(f"author{i}", password="pass12345") for i in range(authors)]
+    for i, user in enumerate(users):
+        user.profile.avatar_url = f"https://example.com/avatar{i}.png"
+        user.profile.save()
+    tag_objs = Tag.objects.bulk_create([Tag(name=f"tag{i}", slug=f"tag{i}") for i in range(tags)])
+
+    articles = Article.objects.bulk_create(
+        [Article(title=f"Article {i}", content="Lorem ipsum", author=users[i % authors]) for i in range(count)]
+    )
+    Article.tags.through.objects.bulk_create(
+        [Article.tags.through(article_id=a.pk, tag_id=t.pk) for a in articles for t in tag_objs]
+    )
+    return articles
+
+
+# Every test request comes from the same client, far over THROTTLE_ANON_RATE
+# a minute: classes that are not about rate limits run without them
+# (accounts.tests.ScopedThrottleTests keeps them on)
+without_throttling = override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": dict.fromkeys(settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]),
+    }
+)
+
+
+def cursor_token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@without_throttling
+class ArticleCursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        articles = make_articles(10)
+        # groups of three share a published_at: ties are broken by id
+        now = timezone.now()
+        for i, article in enumerate(articles):
+            Article.objects.filter(pk=article.pk).update(published_at=now - timedelta(seconds=i // 3))
+
+    def test_walk_forward_and_back(self):
+        expected = list(Article.objects.order_by("-published_at", "-id").values_list("id", flat=True))
+        url, pages = "/api/articles/?pagination=cursor&page_size=3", []
+        while url:
+            pages.append(self.client.get(url).json())
+            url = pages[-1]["next"]
+        self.assertEqual([a["id"] for page in pages for a in page["results"]], expected)
+
+        seen, url = [], pages[-1]["previous"]
+        while url:
+            body = self.client.get(url).json()
+            seen = [a["id"] for a in body["results"]] + seen
+            url = body["previous"]
+        self.assertEqual(seen + [a["id"] for a in pages[-1]["results"]], expected)
+
+    def test_crafted_cursors_are_not_found(self):
+        cursors = [
+            "zzz",
+            cursor_token({"v": ["garbage", 1], "r": 0}),
+            cursor_token({"v": [{"x": 1}, 1], "r": 0}),
+            cursor_token({"v": ["2024-01-01T00:00:00Z", "abc"], "r": 0}),
+            cursor_token({"v": [None, 1], "r": 0}),
+            cursor_token({"v": ["2024-01-01T00:00:00Z"], "r": 0}),
+        ]
+        for cursor in cursors:
+            for url in ("/api/articles/", "/api/async/articles/"):
+                with self.subTest(url=url, cursor=cursor):
+                    response = self.client.get(f"{url}?cursor={cursor}")
+                    self.assertEqual(response.status_code, 404)
+                    self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+    def test_fulltext_search_refuses_cursor_pagination(self):
+        response = self.client.get("/api/articles/?search=article&search_mode=fulltext&pagination=cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("pagination", response.json())
+
+        response = self.client.get("/api/articles/?search=article&search_mode=fulltext&pagination=page")
+        self.assertEqual(response.status_code, 200)
+
+
+@skipUnless(connection.vendor in search.BACKENDS, "no full-text index on this database")
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+@without_throttling
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.writer = User.objects.create_user("writer", password="pass12345", first_name="Dana")
+        self.client.force_login(self.writer)
+        for title, content, tags in [
+            ("Paris food", "croissants and sunsets", ["france"]),
+            ("Santorini sunsets", "Oia is lovely", ["greece"]),
+            ("Nothing", "boring", []),
+        ]:
+            self.client.post(
+                "/api/articles/", {"title": title, "content": content, "tags_input": tags}, content_type="application/json"
+            )
+
+    def titles(self, terms):
+        response = self.client.get("/api/articles/", {"search": terms, "search_mode": "fulltext"})
+        return [a["title"] for a in response.json()]
+
+    def test_ranking(self):
+        # a title match outranks a content match, whatever the publication order
+        self.assertEqual(self.titles("sunset"), ["Santorini sunsets", "Paris food"])
+        self.assertEqual(self.titles("greece"), ["Santorini sunsets"])
+        # author names are indexed; FTS syntax in the input is only text
+        self.assertEqual(len(self.titles('dana "(')), 3)
+
+    def test_index_follows_article_writes(self):
+        nothing = Article.objects.get(title="Nothing")
+        self.client.patch(f"/api/articles/{nothing.pk}/", {"content": "a sunset"}, content_type="application/json")
+        titles = self.titles("sunset")
+        self.assertEqual((titles[0], set(titles[1:])), ("Santorini sunsets", {"Paris food", "Nothing"}))
+
+        self.client.delete(f"/api/articles/{nothing.pk}/")
+        self.assertEqual(self.titles("sunset"), ["Santorini sunsets", "Paris food"])
+
+    def test_index_follows_tag_and_author_renames(self):
+        tag = Tag.objects.get(name="greece")
+        tag.name = "hellas"
+        tag.save()
+        self.assertEqual(self.titles("hellas"), ["Santorini sunsets"])
+        self.assertEqual(self.titles("greece"), [])
+
+        tag.delete()
+        self.assertEqual(self.titles("hellas"), [])
+
+        self.writer.first_name = "Robin"
+        self.writer.save()
+        self.assertEqual(len(self.titles("robin")), 3)
+        self.assertEqual(self.titles("dana"), [])
+
+    def test_index_follows_tag_links(self):
+        article = Article.objects.get(title="Santorini sunsets")
+        article.tags.set([Tag.objects.create(name="cyclades", slug="cyclades")])
+        self.assertEqual(self.titles("cyclades"), ["Santorini sunsets"])
+        self.assertEqual(self.titles("greece"), [])
+
+        tag = Tag.objects.get(name="france")
+        tag.articles.add(article)
+        self.assertEqual(self.titles("france"), ["Paris food", "Santorini sunsets"])
+        tag.articles.clear()
+        self.assertEqual(self.titles("france"), [])
+        article.tags.clear()
+        self.assertEqual(self.titles("cyclades"), [])
+
+    def test_other_user_saves_leave_articles_alone(self):
+        before = sorted(Article.objects.values_list("pk", "updated_at"))
+        self.writer.set_password("changed12345")
+        self.writer.save()
+        self.writer.last_name = ""  # unchanged value
+        self.writer.save(update_fields=["last_name"])
+        self.assertEqual(sorted(Article.objects.values_list("pk", "updated_at")), before)
+
+
+@without_throttling
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.writer = User.objects.create_user("writer", password="pass12345")
+        self.article = Article.objects.create(title="one", content="c", author=self.writer)
+
+    def test_cached_reads_and_etags(self):
+        first = self.client.get("/api/articles/")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/articles/").json(), first.json())
+            response = self.client.get("/api/articles/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], first["ETag"])
+        self.assertEqual(self.client.get("/api/articles/999999/").status_code, 404)
+
+    def test_if_none_match_star_only_for_existing_articles(self):
+        response = self.client.get(f"/api/articles/{self.article.pk}/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get("/api/articles/999999/", HTTP_IF_NONE_MATCH="*").status_code, 404)
+
+    def test_writes_invalidate(self):
+        detail_url = f"/api/articles/{self.article.pk}/"
+        etag = self.client.get(detail_url)["ETag"]
+        self.client.get("/api/articles/")
+
+        self.client.force_login(self.writer)
+        self.client.patch(detail_url, {"title": "renamed"}, content_type="application/json")
+        self.client.logout()
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.json()["title"]), (200, "renamed"))
+        self.assertEqual(self.client.get("/api/articles/").json()[0]["title"], "renamed")
+
+        self.writer.profile.avatar_url = "https://example.com/a.png"
+        self.writer.profile.save()
+        latest = self.client.get("/api/articles/latest/").json()
+        self.assertEqual(latest[0]["author_avatar_url"], "https://example.com/a.png")
+
+        tag = Tag.objects.create(name="x", slug="x")
+        self.article.tags.add(tag)
+        self.assertEqual(self.client.get("/api/articles/").json()[0]["tags"], [{"id": tag.pk, "name": "x"}])
+        tag.name = "y"
+        tag.save()
+        self.assertEqual(self.client.get(detail_url).json()["tags"][0]["name"], "y")
+        tag.delete()
+        self.assertEqual(self.client.get(detail_url).json()["tags"], [])
+
+        Comment.objects.create(article=self.article, author=self.writer, content="hi")
+        self.assertEqual(self.client.get("/api/articles/").json()[0]["comment_count"], 1)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+@without_throttling
+class ArticleQueryCountTests(TestCase):
+    """
+    Read endpoints must cost a fixed number of queries, whatever the row count:
+    articles + author + profile in one query, tags in one prefetch.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_latest_and_retrieve(self):
+        for count in ROW_COUNTS:
+            with self.subTest(rows=count):
+                Article.objects.all().delete()
+                User.objects.all().delete()
+                Tag.objects.all().delete()
+                articles = make_articles(count)
+
+                with self.assertNumQueries(2):
+                    response = self.client.get("/api/articles/")
+                self.assertEqual(len(response.json()), count)
+                self.assertTrue(all(a["author_avatar_url"] for a in response.json()))
+
+                with self.assertNumQueries(2):
+                    self.client.get("/api/articles/latest/")
+
+                with self.assertNumQueries(2):
+                    response = self.client.get(f"/api/articles/{articles[-1].pk}/")
+                self.assertEqual(len(response.json()["tags"]), 3)
+
+    def test_author_without_profile(self):
+        make_articles(1)
+        User.objects.get(username="author0").profile.delete()
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/articles/")
+        self.assertEqual(response.json()[0]["author_avatar_url"], "")
+
+
+@without_throttling
+class TagWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user("writer", password="pass12345"))
+        Tag.objects.create(name="old", slug="old")
+
+    def write(self, method, url, tags):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(
+                url, {"title": "t", "content": "c", "tags_input": tags}, content_type="application/json"
+            )
+        self.assertIn(response.status_code, (200, 201))
+        return response.json(), queries
+
+    def test_query_count_does_not_grow_with_tags(self):
+        few, few_queries = self.write("post", "/api/articles/", ["a0", "old"])
+        many, many_queries = self.write("post", "/api/articles/", [f"b{i}" for i in range(20)] + ["B1", " old "])
+        self.assertEqual(len(few_queries), len(many_queries))
+        self.assertEqual(len(many["tags"]), 21)
+        self.assertEqual(Tag.objects.filter(slug="old").count(), 1)
+
+        self.write("patch", f"/api/articles/{few['id']}/", ["a0", "old"])  # group membership now cached
+        _, small_change = self.write("patch", f"/api/articles/{few['id']}/", ["a0", "new1"])
+        article, big_change = self.write("patch", f"/api/articles/{many['id']}/", ["b1", "new2", "old"])
+        self.assertEqual(len(small_change), len(big_change))
+        self.assertEqual(sorted(t["name"] for t in article["tags"]), ["b1", "new2", "old"])
+
+        # only the changed links are written: one DELETE, one INSERT of one row
+        through = Article.tags.through._meta.db_table
+        writes = [q["sql"] for q in big_change.captured_queries if through in q["sql"] and "SELECT" not in q["sql"]]
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(Article.tags.through.objects.filter(article_id=many["id"]).count(), 3)
+
+
+class TagSlugMigrationTests(TransactionTestCase):
+    before = [("posts", "0003_article_search_index")]
+    after = [("posts", "0005_tag_slug_unique")]
+
+    def tearDown(self):
+        # back to the current schema for the tests that follow
+        call_command("migrate", verbosity=0)
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def test_case_duplicates_merge_onto_the_oldest_tag(self):
+        apps = self.migrate(self.before)
+        Tag, Article = apps.get_model("posts", "Tag"), apps.get_model("posts", "Article")
+        author = apps.get_model("auth", "User").objects.create(username="writer")
+        tags = [Tag.objects.create(name=name) for name in ("Travel", "travel", " TRAVEL", "Food")]
+        articles = [Article.objects.create(title=f"a{i}", content="c", author=author) for i in range(4)]
+        for article, tag in zip(articles, tags[:3]):
+            article.tags.add(tag)
+        articles[3].tags.add(tags[0], tags[1], tags[3])
+
+        apps = self.migrate(self.after)
+        Tag, Article = apps.get_model("posts", "Tag"), apps.get_model("posts", "Article")
+        self.assertEqual(
+            list(Tag.objects.order_by("id").values_list("name", "slug")), [("Travel", "travel"), ("Food", "food")]
+        )
+        travel = Tag.objects.get(slug="travel")
+        self.assertEqual(
+            sorted(Article.tags.through.objects.filter(tag=travel).values_list("article_id", flat=True)),
+            [a.pk for a in articles],
+        )
+        self.assertEqual(Article.objects.get(pk=articles[3].pk).tags.count(), 2)
+
+
+@without_throttling
+class TagSlugFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user("writer", password="pass12345"))
+        for title, tags in (("a", ["Travel", "Greek Islands"]), ("b", ["travel ", "islands"])):
+            self.client.post(
+                "/api/articles/", {"title": title, "content": "c", "tags_input": tags}, content_type="application/json"
+            )
+
+    def test_filters_match_on_slug(self):
+        self.assertEqual(Tag.objects.count(), 3)
+        for query, count in (
+            ("tags__name__iexact=TRAVEL", 2),
+            ("tags__name__iexact=travel%20", 2),
+            ("tags__name__icontains=Island", 2),
+            ("tags__name__icontains=greek", 1),
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(len(self.client.get(f"/api/articles/?{query}").json()), count)
+
+
+class ImportExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        articles = make_articles(5)
+        reader = User.objects.create_user("reader", password="pass12345", first_name="Rea")
+        for article in articles[:3]:
+            Comment.objects.create(article=article, author=reader, content=f"On {article.title}")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def export(self, name, **options):
+        path = os.path.join(self.tmp.name, name)
+        call_command("export_articles", path, stderr=StringIO(), **options)
+        with open(path, encoding="utf-8") as fh:
+            records = [json.loads(line) for line in fh]
+        for record in records:
+            del record["id"]
+        return path, sorted(records, key=lambda r: r["title"])
+
+    def test_round_trip(self):
+        path, exported = self.export("articles.ndjson", batch_size=2)
+        self.assertEqual(len(exported), 5)
+
+        User.objects.all().delete()
+        Tag.objects.all().delete()
+        call_command("import_articles", path, batch_size=2, stdout=StringIO())
+
+        _, reimported = self.export("again.ndjson")
+        self.assertEqual(reimported, exported)
+        self.assertEqual(sorted(Article.objects.values_list("comment_count", flat=True)), [0, 0, 1, 1, 1])
+        self.assertTrue(User.objects.get(username="reader").groups.filter(name="user").exists())
+        self.assertEqual(Tag.objects.count(), 3)
+
+
+@without_throttling
+class ArticleExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_articles(30)
+        author = User.objects.get(username="author0")
+        self.other = Article.objects.create(title="Sailing notes", content="Boats", author=author)
+        self.other.tags.add(Tag.objects.create(name="Sailing", slug="sailing"))
+
+    def body(self, query=""):
+        resp = self.client.get(f"/api/articles/export/{query}")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        return b"".join(resp.streaming_content).decode()
+
+    def test_ndjson_matches_list(self):
+        rows = [json.loads(line) for line in self.body().splitlines()]
+        self.assertEqual(len(rows), 31)
+        self.assertEqual(
+            sorted(rows, key=lambda r: r["id"]), sorted(self.client.get("/api/articles/").json(), key=lambda r: r["id"])
+        )
+
+    def test_csv(self):
+        rows = list(csv.DictReader(StringIO(self.body("?export_format=csv"))))
+        self.assertEqual(len(rows), 31)
+        by_title = {row["title"]: row for row in rows}
+        self.assertEqual(by_title["Article 0"]["tags"], "tag0|tag1|tag2")
+        self.assertEqual(by_title["Sailing notes"]["tags"], "Sailing")
+
+    def test_csv_with_sparse_fields(self):
+        rows = list(csv.DictReader(StringIO(self.body("?export_format=csv&fields=id,title"))))
+        self.assertEqual(len(rows), 31)
+        self.assertEqual(set(rows[0]), {"id", "title"})
+
+    def test_filters_apply_to_stream(self):
+        for query in ("?tags__name__iexact=SAILING", "?search=boats", "?export_format=csv&search=sailing"):
+            with self.subTest(query=query):
+                body = self.body(query)
+                self.assertIn("Sailing notes", body)
+                self.assertNotIn("Article 0", body)
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get("/api/articles/export/?export_format=xml").status_code, 400)
+
+
+class IndexMigrationTests(SimpleTestCase):
+    def test_concurrent_index_migrations_are_not_atomic(self):
+        migrations = [
+            migration
+            for migration in MigrationLoader(None, ignore_no_migrations=True).disk_migrations.values()
+            if any(isinstance(op, AddIndexConcurrently) for op in migration.operations)
+        ]
+        names = {(migration.app_label, migration.name) for migration in migrations}
+        self.assertLessEqual(
+            {("posts", "0007_article_indexes"), ("comments", "0002_comment_article_created_idx")}, names
+        )
+        for migration in migrations:
+            with self.subTest(migration=f"{migration.app_label}.{migration.name}"):
+                self.assertFalse(migration.atomic)
+
+
+@without_throttling
+class ExplainQueriesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        article = make_articles(1)[0]
+        Comment.objects.create(article=article, author=article.author, content="c")
+        self.urls = ("/api/articles/", f"/api/articles/{article.pk}/comments/")
+
+    def test_explains_the_queries_the_views_run(self):
+        with CaptureQueriesContext(connection) as explained:
+            call_command("explain_queries", stdout=StringIO())
+        explained = {query["sql"] for query in explained.captured_queries}
+
+        for url in self.urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as ran:
+                self.client.get(url)
+            # the rows themselves (not the per-page tags query)
+            sql = ran.captured_queries[0]["sql"]
+            self.assertTrue(any(query.endswith(sql) and query.startswith("EXPLAIN") for query in explained), sql)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+@without_throttling
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_articles(3)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), queries.captured_queries[0]["sql"]
+
+    def test_compact_view_does_not_load_content(self):
+        data, sql = self.get("/api/articles/?view=compact")
+        self.assertNotIn("content", data[0])
+        self.assertEqual(len(data[0]["tags"]), 3)
+        self.assertNotIn('"content"', sql)
+
+    def test_fields_projection(self):
+        data, sql = self.get("/api/articles/?fields=id,title")
+        self.assertEqual(set(data[0]), {"id", "title"})
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn('"content"', sql)
+
+        data, sql = self.get("/api/articles/?fields=title,author_name&pagination=cursor&page_size=2")
+        self.assertEqual(set(data["results"][0]), {"title", "author_name"})
+        self.assertIsNotNone(data["next"])
+
+
+class FastReadParityTests(TestCase):
+    """ValuesReadMixin.fast_data renders to the same bytes as serializer.data."""
+
+    def assertParity(self, serializer_class, queryset, query=""):
+        request = Request(APIRequestFactory().get("/" + query))
+        context = {"request": request}
+        expected = serializer_class(list(queryset), many=True, context=context).data
+        serializer = serializer_class(context=context)
+        actual = serializer.fast_data(serializer.values_queryset(queryset))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_articles(self):
+        articles = make_articles(6)
+        # the edge cases of every field
+        User.objects.get(username="author0").profile.delete()
+        author1 = User.objects.get(username="author1")
+        author1.profile.avatar_url = None
+        author1.profile.save()
+        Article.objects.filter(pk=articles[1].pk).update(
+            title="Ünïcödé — “quotes” \\ \"", image_url="https://example.com/a.png",
+            published_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            comment_count=2, last_comment_at=datetime(2024, 1, 2, 3, 4, 5, 678900, tzinfo=dt_timezone.utc),
+        )
+        articles[2].tags.clear()
+        articles[3].tags.add(Tag.objects.create(name="Aardvark"))
+
+        queryset = Article.objects.with_related()
+        for query in ("", "?fields=id,tags", "?fields=author_avatar_url,title"):
+            with self.subTest(query=query):
+                self.assertParity(ArticleSerializer, queryset, query)
+        self.assertParity(ArticleListSerializer, queryset)
+
+    def test_comments(self):
+        article = make_articles(1)[0]
+        Comment.objects.bulk_create(
+            [Comment(article=article, author=article.author, content=f"c{i} ✓") for i in range(3)]
+        )
+        self.assertParity(CommentSerializer, Comment.objects.select_related("author"))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+@without_throttling
+class AsyncReadParityTests(TestCase):
+    """The /api/async/ endpoints return the same bytes as their sync counterparts."""
+
+    def setUp(self):
+        cache.clear()
+
+    def assertSameResponse(self, sync_url, async_url):
+        expected = self.client.get(sync_url)
+        actual = self.client.get(async_url)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content.replace(b"/api/articles/", b"/api/async/articles/"))
+
+    def test_articles_and_comments(self):
+        articles = make_articles(5)
+        Comment.objects.bulk_create(
+            [Comment(article=articles[0], author=articles[1].author, content=f"c{i}") for i in range(3)]
+        )
+        pk = articles[0].pk
+
+        for suffix in (
+            "",
+            "?author=author1",
+            "?tags__name__iexact=TAG1",
+            "?pagination=cursor&page_size=2",
+            "latest/",
+            f"{pk}/",
+            "999999/",
+            f"{pk}/comments/",
+            f"{pk}/comments/?pagination=cursor&page_size=2",
+        ):
+            with self.subTest(suffix=suffix):
+                self.assertSameResponse(f"/api/articles/{suffix}", f"/api/async/articles/{suffix}")
+
+        with self.assertNumQueries(2):
+            self.client.get("/api/async/articles/")
+        with self.assertNumQueries(1):
+            self.client.get(f"/api/async/articles/{pk}/comments/")
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite settings")
+class SQLiteSettingsTests(SimpleTestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        # the test database lives in memory, where journal_mode cannot be WAL
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_dict = {**connections.settings["default"], "NAME": os.path.join(tmp.name, "db.sqlite3")}
+        wrapper = connections["default"].__class__(settings_dict, alias="sqlite_settings")
+        self.addCleanup(wrapper.close)
+
+        with wrapper.cursor() as cursor:
+            for pragma, expected in (
+                ("journal_mode", "wal"),
+                ("synchronous", 1),  # NORMAL
+                ("temp_store", 2),  # MEMORY
+                ("cache_size", -20000),
+                ("busy_timeout", 20000),
+            ):
+                with self.subTest(pragma=pragma):
+                    cursor.execute(f"PRAGMA {pragma}")
+                    self.assertEqual(cursor.fetchone()[0], expected)
+        self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaRoutingTests(SimpleTestCase):
+    def test_reads_pinned_to_primary_after_write(self):
+        router = PrimaryReplicaRouter()
+        with routing_scope() as scope:
+            self.assertEqual(router.db_for_read(Article), "replica1")
+            self.assertEqual(router.db_for_read(Comment), "replica1")
+            self.assertIsNone(router.db_for_read(User))  # auth app: default routing
+
+            self.assertEqual(router.db_for_write(Article), "default")
+            self.assertTrue(scope.wrote)
+            self.assertEqual(router.db_for_read(Article), "default")
+
+        with routing_scope(pinned=True):
+            self.assertEqual(router.db_for_read(Article), "default")
+        with routing_scope():
+            self.assertEqual(router.db_for_read(Article), "replica1")
+
+
+@skipUnless(renderers.orjson, "orjson not installed")
+class FastJSONRendererTests(SimpleTestCase):
+    def test_same_bytes_as_drf(self):
+        data = {
+            "published_at": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            "day": date(2024, 1, 2),
+            "price": Decimal("1.50"),
+            "uuid": UUID(int=1),
+            "lazy": gettext_lazy("Not found."),
+            "error": ErrorDetail("bad", code="invalid"),
+            1: "int key",
+            "text": "Ünïcödé \u2028 \u2029 🙂 \"q\"",
+            "nested": [{"a": None, "b": True, "c": 1.5}],
+            "huge": 2**70,
+        }
+        for payload in (data, [data], None):
+            with self.subTest(payload=type(payload)):
+                self.assertEqual(
+                    renderers.FastJSONRenderer().render(payload),
+                    JSONRenderer().render(payload),
+                )
+        # floats: only the differences documented in common.renderers
+        for value in (0.1, -0.0, 1.5, 1e16, 1e22, 2.5e-10, 5e-324, 1.7976931348623157e308):
+            with self.subTest(value=value):
+                self.assertEqual(renderers.FastJSONRenderer().render([value]), JSONRenderer().render([value]))
+        for value, fast, drf in ((1e-7, b"[1e-7]", b"[1e-07]"), (-3e-5, b"[-0.00003]", b"[-3e-05]")):
+            with self.subTest(value=value):
+                self.assertEqual(renderers.FastJSONRenderer().render([value]), fast)
+                self.assertEqual(JSONRenderer().render([value]), drf)
+                self.assertEqual(json.loads(fast), json.loads(drf))
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.subTest(value=value):
+                self.assertEqual(renderers.FastJSONRenderer().render([value]), b"[null]")
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render([value])
+
+        # indented output (browsable API) falls back to DRF
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+    def test_parser(self):
+        body = '{"title": "Ünïcödé", "tags_input": ["a"]}'.encode()
+        self.assertEqual(renderers.FastJSONParser().parse(BytesIO(body)), {"title": "Ünïcödé", "tags_input": ["a"]})
+        with self.assertRaises(ParseError):
+            renderers.FastJSONParser().parse(BytesIO(b'{"a": NaN}'))
+
+
+@without_throttling
+class ArticleChangesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.articles = make_articles(4)
+        # everything so far is older than the safety margin
+        Article.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.watermark = self.client.get("/api/articles/changes/").json()["watermark"]
+
+    def changes(self):
+        response = self.client.get("/api/articles/changes/", {"since": self.watermark})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_only_changed_and_deleted_articles(self):
+        data = self.changes()
+        self.assertEqual((data["changed"], data["deleted"]), ([], []))
+        self.assertGreater(data["watermark"], self.watermark)
+
+        edited, retagged, commented, deleted = self.articles
+        deleted_pk = deleted.pk
+        edited.title = "edited"
+        edited.save()
+        retagged.tags.add(Tag.objects.create(name="new"))
+        Comment.objects.create(article=commented, author=commented.author, content="hi")
+        deleted.delete()
+
+        data = self.changes()
+        self.assertEqual({a["id"] for a in data["changed"]}, {edited.pk, retagged.pk, commented.pk})
+        self.assertEqual(data["deleted"], [deleted_pk])
+        self.assertEqual(next(a for a in data["changed"] if a["id"] == commented.pk)["comment_count"], 1)
+
+    @override_settings(SYNC_PAGE_SIZE=3)
+    def test_pages_by_updated_at_and_id(self):
+        extra = Article.objects.bulk_create(
+            [Article(title=f"More {i}", content="c", author=self.articles[0].author) for i in range(3)]
+        )
+        # all seven tie on updated_at: the id breaks the tie
+        Article.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+        since, seen, pages = None, [], []
+        while True:
+            data = self.client.get("/api/articles/changes/", {"since": since} if since else {}).json()
+            pages.append(data)
+            seen += [a["id"] for a in data["changed"]]
+            since = data["watermark"]
+            if not data["has_more"]:
+                break
+
+        self.assertEqual([len(p["changed"]) for p in pages], [3, 3, 1])
+        self.assertEqual(seen, sorted(a.pk for a in self.articles + extra))
+        # the last page hands back the time of the first one
+        self.assertEqual(since, pages[0]["watermark"].split(",")[0])
+
+    def test_bad_and_expired_watermarks(self):
+        response = self.client.get("/api/articles/changes/", {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        for last_id in ("x", "\u00b2"):
+            since = f"{self.watermark},{self.watermark},{last_id}"
+            response = self.client.get("/api/articles/changes/", {"since": since})
+            self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/articles/changes/", {"since": "2000-01-01T00:00:00Z"})
+        self.assertEqual(response.status_code, 410)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+@without_throttling
+class BatchReadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_articles_in_order_with_latest_comments(self):
+        articles = make_articles(4)
+        first, second = articles[:2]
+        Comment.objects.bulk_create(
+            [Comment(article=first, author=first.author, content=f"c{i}") for i in range(4)]
+        )
+
+        url = f"/api/articles/batch/?ids={second.pk},{first.pk},999999,{second.pk}&comments=2"
+        with self.assertNumQueries(3):  # articles, tags, comments
+            data = self.client.get(url).json()
+
+        self.assertEqual([a["id"] for a in data["results"]], [second.pk, first.pk])
+        self.assertEqual(data["missing"], [999999])
+        self.assertEqual(data["results"][0]["comments"], [])
+        self.assertEqual([c["content"] for c in data["results"][1]["comments"]], ["c2", "c3"])
+
+        detail = self.client.get(f"/api/articles/{first.pk}/").json()
+        self.assertEqual({k: v for k, v in data["results"][1].items() if k != "comments"}, detail)
+
+        with self.assertNumQueries(2):
+            ids = ",".join(str(a.pk) for a in articles)
+            self.assertEqual(len(self.client.get(f"/api/articles/batch/?ids={ids}").json()["results"]), 4)
+
+    def test_limits(self):
+        for query in (
+            "",
+            "ids=1,x",
+            "ids=" + ",".join(map(str, range(1, 102))),
+            "ids=1&comments=21",
+            "ids=1&comments=-1",
+            "ids=1&comments=%C2%B2",  # "²": str.isdigit() accepts it, int() does not
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/api/articles/batch/?{query}").status_code, 400)
+
+
+@without_throttling
+class BulkWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user("owner", password="pass12345")
+        self.other = User.objects.create_user("other", password="pass12345")
+        self.client.force_login(self.owner)
+
+    def bulk(self, operations):
+        return self.client.post("/api/articles/bulk/", {"operations": operations}, content_type="application/json")
+
+    def test_mixed_operations_report_per_item(self):
+        mine, doomed = (Article.objects.create(title=t, content="c", author=self.owner) for t in ("mine", "doomed"))
+        theirs = Article.objects.create(title="theirs", content="c", author=self.other)
+        self.client.get("/api/articles/")  # cached list must be dropped
+
+        response = self.bulk([
+            {"op": "create", "data": {"title": "new", "content": "zebra", "tags_input": ["News", "news "]}},
+            {"op": "update", "id": mine.pk, "data": {"title": "renamed", "tags_input": ["Django"]}},
+            {"op": "update", "id": theirs.pk, "data": {"title": "hijacked"}},
+            {"op": "delete", "id": 999999},
+            {"op": "create", "data": {"content": "no title"}},
+            {"op": "delete", "id": doomed.pk},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], [201, 200, 403, 404, 400, 204])
+        self.assertIn("title", results[4]["errors"])
+
+        created = results[0]["article"]
+        self.assertEqual(created["author_name"], "owner")
+        self.assertEqual([t["name"] for t in created["tags"]], ["News"])
+        self.assertEqual([t["name"] for t in results[1]["article"]["tags"]], ["Django"])
+        self.assertEqual(self.client.get(f"/api/articles/{mine.pk}/").json(), results[1]["article"])
+
+        self.assertEqual(Article.objects.get(pk=theirs.pk).title, "theirs")
+        self.assertFalse(Article.objects.filter(pk=doomed.pk).exists())
+        titles = {a["title"] for a in self.client.get("/api/articles/").json()}
+        self.assertEqual(titles, {"new", "renamed", "theirs"})
+        found = self.client.get("/api/articles/?search=zebra&search_mode=fulltext").json()
+        self.assertEqual([a["id"] for a in found], [created["id"]])
+
+    def test_retag_writes_only_the_difference(self):
+        article = Article.objects.create(title="a", content="c", author=self.owner)
+        kept, dropped = Tag.objects.resolve(["kept", "dropped"])
+        article.tags.add(kept, dropped)
+        Through = Article.tags.through
+        kept_link = Through.objects.get(article=article, tag=kept).pk
+
+        def retag(names):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk([{"op": "update", "id": article.pk, "data": {"tags_input": names}}])
+            self.assertEqual(response.json()["results"][0]["status"], 200)
+            table = connection.ops.quote_name(Through._meta.db_table)
+            return [
+                q["sql"].split()[0]
+                for q in queries
+                if q["sql"].startswith((f"DELETE FROM {table}", f"INSERT INTO {table}"))
+            ]
+
+        self.assertEqual(retag(["Kept", "added"]), ["DELETE", "INSERT"])
+        self.assertEqual(sorted(article.tags.values_list("name", flat=True)), ["added", "kept"])
+        self.assertEqual(Through.objects.get(article=article, tag=kept).pk, kept_link)
+        self.assertEqual(retag(["kept", "added"]), [])
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def write(count):
+            articles = Article.objects.bulk_create(
+                [Article(title=f"a{i}", content="c", author=self.owner) for i in range(count)]
+            )
+            operations = [{"op": "create", "data": {"title": "n", "content": "c", "tags_input": ["t"]}}] * count
+            operations += [{"op": "update", "id": a.pk, "data": {"title": "u", "tags_input": ["t"]}} for a in articles]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.bulk(operations).status_code, 200)
+            return len(queries)
+
+        write(1)  # tag "t" exists from here on
+        self.assertEqual(write(2), write(20))
+
+    def test_limits(self):
+        for payload in ({}, {"operations": []}, {"operations": [{"op": "delete", "id": 1}] * 501}):
+            with self.subTest(payload=len(payload.get("operations", ()))):
+                response = self.client.post("/api/articles/bulk/", payload, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+
+        self.client.logout()
+        self.assertEqual(self.bulk([{"op": "delete", "id": 1}]).status_code, 401)
+
+
+@without_throttling
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for metric in metrics.REGISTRY:
+            metric.clear()
+        make_articles(3)
+
+    def test_server_timing_counts_the_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/articles/")
+        db, total = response["Server-Timing"].split(", ")
+        self.assertRegex(db, rf'^db;dur=[\d.]+;desc="{len(queries)} queries"$')
+        self.assertRegex(total, r"^total;dur=[\d.]+$")
+
+    def test_slow_queries_are_logged_with_the_view(self):
+        with override_settings(SLOW_QUERY_MS=0), self.assertLogs("common.middleware", "WARNING") as logs:
+            self.client.get("/api/articles/latest/")
+        self.assertIn("in articles-latest: SELECT", logs.output[0])
+
+    def test_metrics_endpoint(self):
+        self.client.get("/api/articles/")
+        self.client.get("/api/articles/")
+        with override_settings(METRICS_TOKEN="secret"):
+            body = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn('http_request_duration_seconds_bucket{view="articles-list",method="GET",le="+Inf"} 2', body)
+        self.assertIn('http_responses_total{view="articles-list",method="GET",status="200"} 2', body)
+
+        with override_settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer other").status_code, 403)
+
+    def test_unknown_methods_share_one_series(self):
+        self.client.generic("FOO", "/api/articles/")
+        self.client.generic("BAR", "/api/articles/")
+        with override_settings(METRICS_TOKEN="secret"):
+            body = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="articles-list",method="other"} 2', body)
+        self.assertNotIn('method="FOO"', body)
+
+    def test_metrics_closed_without_token(self):
+        with override_settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer ").status_code, 403)
+            with override_settings(DEBUG=True):
+                self.assertEqual(self.client.get("/metrics").status_code, 200)
@@ -1,8 +1,14 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import ArticleViewSet
 
 router = DefaultRouter()
 router.register(r"articles", ArticleViewSet, basename="articles")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    # ASGI-native reads, same responses as the viewset (see posts.async_views)
+    path("async/articles/", async_views.article_list, name="async-articles-list"),
+    path("async/articles/latest/", async_views.article_latest, name="async-articles-latest"),
+    path("async/articles/<int:pk>/", async_views.article_detail, name="async-articles-detail"),
+]
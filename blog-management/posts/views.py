@@ -1,23 +1,58 @@
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions, decorators, response
-from rest_framework.filters import SearchFilter
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Article
-from .serializers import ArticleSerializer
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from .bulk import apply_operations
+from .cache import ARTICLE_LIST_VERSION, article_version
+from .filters import ArticleFilter, ArticleSearchFilter
+from .models import Article, ArticleTombstone
+from .serializers import ArticleListSerializer, ArticleSerializer
+from common.cache import VersionedCacheMixin
+from common.pagination import (
+    ArticleCursorPagination,
+    DefaultTwoPerPagePagination,
+    SelectablePaginationMixin,
+)
 from common.permissions import IsOwnerOrAdminGroup
+from common.streaming import iter_csv, iter_ndjson
+from common.sync import changes_response
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
-    queryset = Article.objects.select_related("author").prefetch_related("tags")
+class ArticleViewSet(VersionedCacheMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
+    queryset = Article.objects.with_related()
     serializer_class = ArticleSerializer
+    # create/update/delete only (common.throttling.ScopedWriteRateThrottle)
+    throttle_scope = "article_write"
 
     # If you want ALL articles returned (no pagination)
     pagination_class = None
 
-    filter_backends = [DjangoFilterBackend, SearchFilter]
-    filterset_fields = {
-    "tags__name": ["iexact", "icontains"],
-}
+    # Opt-in pagination: ?pagination=cursor (keyset on published_at, id;
+    # ?page_size=N up to ArticleCursorPagination.max_page_size) or ?pagination=page
+    pagination_modes = {
+        "cursor": ArticleCursorPagination,
+        "page": DefaultTwoPerPagePagination,
+    }
+
+    # ?search_mode=fulltext switches ?search= to the ranked full-text index
+    filter_backends = [DjangoFilterBackend, ArticleSearchFilter]
+    # ?tags__name__iexact= / ?tags__name__icontains=, matched on Tag.slug
+    filterset_class = ArticleFilter
+
+    # columns each serializer field reads, for the .only() projection in
+    # get_queryset; unlisted fields read the column of the same name
+    FIELD_COLUMNS = {
+        "author_name": ("author__username",),
+        "author_avatar_url": ("author__profile__avatar_url",),
+        "tags": (),
+    }
+    FIELD_JOINS = {
+        "author_name": ("author",),
+        "author_avatar_url": ("author", "author__profile"),
+    }
 
     search_fields = [
         "title",
@@ -35,17 +70,224 @@ class ArticleViewSet(viewsets.ModelViewSet):
         permission_classes=[permissions.AllowAny],
     )
     def latest(self, request):
-        latest_three = self.get_queryset().order_by("-published_at")[:3]
-        data = self.get_serializer(latest_three, many=True).data
-        return response.Response(data)
+        return self.cached_response(request, self._latest)
+
+    def _latest(self):
+        serializer = self.get_serializer()
+        latest_three = serializer.values_queryset(self.get_queryset().order_by("-published_at"))[:3]
+        return response.Response(serializer.fast_data(latest_three))
+
+    EXPORT_CHUNK_SIZE = 500
+    EXPORT_CSV_FIELDS = (
+        "id", "title", "content", "published_at",
+        "author_name", "author_avatar_url", "image_url", "tags",
+    )
+
+    @decorators.action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[permissions.AllowAny],
+    )
+    def export(self, request):
+        """
+        Stream every matching article as NDJSON (default) or CSV
+        (?export_format=csv). Accepts the same filters and ?search= as the list;
+        rows are read with iterator() and serialized one at a time, so memory
+        does not grow with the number of articles.
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in ("ndjson", "csv"):
+            raise ValidationError({"export_format": "Use 'ndjson' or 'csv'."})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        rows = (
+            self.get_serializer(article).data
+            for article in queryset.iterator(chunk_size=self.EXPORT_CHUNK_SIZE)
+        )
+
+        if export_format == "csv":
+            # ?fields= trims the columns too
+            readable = serializer.readable_field_names
+            columns = [name for name in self.EXPORT_CSV_FIELDS if name in readable]
+            if "tags" in columns:
+                rows = ({**row, "tags": "|".join(t["name"] for t in row["tags"])} for row in rows)
+            resp = StreamingHttpResponse(iter_csv(rows, columns), content_type="text/csv")
+            resp["Content-Disposition"] = 'attachment; filename="articles.csv"'
+        else:
+            resp = StreamingHttpResponse(iter_ndjson(rows), content_type="application/x-ndjson")
+            resp["Content-Disposition"] = 'attachment; filename="articles.ndjson"'
+        return resp
+
+    @decorators.action(
+        detail=False,
+        methods=["get"],
+        url_path="changes",
+        permission_classes=[permissions.AllowAny],
+    )
+    def changes(self, request):
+        """
+        Articles changed and ids deleted since ?since=<watermark> (see
+        common.sync); without ?since=, every article and a first watermark.
+        """
+        return changes_response(
+            request,
+            self.get_serializer(),
+            self.get_queryset(),
+            ArticleTombstone.objects.values_list("article_id", flat=True),
+        )
+
+    BATCH_MAX_IDS = 100
+    BATCH_MAX_COMMENTS = 20
+
+    @decorators.action(
+        detail=False,
+        methods=["get"],
+        url_path="batch",
+        permission_classes=[permissions.AllowAny],
+    )
+    def batch(self, request):
+        """
+        Several articles in one response, in the order asked:
+        ?ids=3,1,2 (up to BATCH_MAX_IDS) and optionally ?comments=N for the
+        N newest comments of each (up to BATCH_MAX_COMMENTS, oldest first).
+        Unknown ids are listed in "missing". Three queries whatever the
+        counts: articles, tags, comments.
+        """
+        return self.cached_response(request, self._batch)
+
+    def _batch_params(self):
+        if not hasattr(self, "_batch_ids"):
+            params = self.request.query_params
+            try:
+                ids = [int(pk) for pk in params.get("ids", "").split(",") if pk.strip()]
+            except ValueError:
+                raise ValidationError({"ids": "Expected a comma-separated list of article ids."})
+            ids = list(dict.fromkeys(ids))
+            if not ids or len(ids) > self.BATCH_MAX_IDS:
+                raise ValidationError({"ids": f"Pass between 1 and {self.BATCH_MAX_IDS} article ids."})
+
+            error = {"comments": f"Expected a number from 0 to {self.BATCH_MAX_COMMENTS}."}
+            try:
+                comments = int(params.get("comments", "0"))
+            except ValueError:
+                raise ValidationError(error)
+            if not 0 <= comments <= self.BATCH_MAX_COMMENTS:
+                raise ValidationError(error)
+            self._batch_ids, self._batch_comments = ids, comments
+        return self._batch_ids, self._batch_comments
+
+    def _batch(self):
+        ids, comment_count = self._batch_params()
+
+        serializer = self.get_serializer()
+        rows = list(serializer.values_queryset(self.get_queryset().filter(pk__in=ids), extra=("id",)))
+        articles = {row["id"]: data for row, data in zip(rows, serializer.fast_data(rows))}
+
+        if comment_count:
+            for data in articles.values():
+                data["comments"] = []
+            comment_serializer = CommentSerializer(context=self.get_serializer_context())
+            comments = Comment.objects.filter(article_id__in=articles).latest_per_article(comment_count)
+            comment_rows = list(
+                comment_serializer.values_queryset(comments.order_by("created_at", "id"), extra=("article_id",))
+            )
+            for row, data in zip(comment_rows, comment_serializer.fast_data(comment_rows)):
+                articles[row["article_id"]]["comments"].append(data)
+
+        return response.Response({
+            "results": [articles[pk] for pk in ids if pk in articles],
+            "missing": [pk for pk in ids if pk not in articles],
+        })
+
+    BULK_MAX_OPERATIONS = 500
+
+    @decorators.action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create, update and delete many articles in one request; see
+        posts.bulk for the format. Each operation succeeds or fails on its
+        own; created and updated articles come back rendered.
+        """
+        operations = request.data.get("operations") if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not 1 <= len(operations) <= self.BULK_MAX_OPERATIONS:
+            raise ValidationError(
+                {"operations": f"Expected a list of 1 to {self.BULK_MAX_OPERATIONS} operations."}
+            )
+
+        context = self.get_serializer_context()
+        operations = apply_operations(operations, request.user, ArticleSerializer, context)
+
+        written = [op.pk for op in operations if op.ok and op.op != "delete"]
+        serializer = ArticleSerializer(context=context)
+        rows = list(serializer.values_queryset(Article.objects.filter(pk__in=written), extra=("id",)))
+        rendered = {row["id"]: data for row, data in zip(rows, serializer.fast_data(rows))}
+        return response.Response({"results": [op.result(rendered) for op in operations]})
+
+    def get_serializer_class(self):
+        # ?view=compact: card fields only (no content)
+        if self.action in ("list", "latest", "changes", "batch") and self.request.query_params.get("view") == "compact":
+            return ArticleListSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+
+        # Load only what the (possibly ?fields=-trimmed) serializer outputs:
+        # `content` stays in the database for compact / sparse responses.
+        fields = self.get_serializer().readable_field_names
+        columns = {"id", "published_at"}  # ordering and cursor values
+        joins = []
+        for name in fields:
+            columns.update(self.FIELD_COLUMNS.get(name, (name,)))
+            joins += [j for j in self.FIELD_JOINS.get(name, ()) if j not in joins]
+
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        queryset = queryset.only(*columns)
+        if "tags" not in fields:
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+    # Public reads go through the versioned response cache (common.cache);
+    # posts.signals bumps the versions on writes.
+    def get_cache_versions(self):
+        if self.action == "retrieve":
+            return [article_version(self.kwargs["pk"])]
+        if self.action == "batch":
+            # comment writes bump their article's version too (posts.signals)
+            return [article_version(pk) for pk in self._batch_params()[0]]
+        return [ARTICLE_LIST_VERSION]
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, self._list)
+
+    def _list(self):
+        # ListModelMixin.list on the fast read path: values() rows instead of
+        # model instances, same JSON (see ValuesReadMixin)
+        serializer = self.get_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = serializer.values_queryset(queryset, extra=("id", "published_at"))  # cursor values
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.fast_data(page))
+        return response.Response(serializer.fast_data(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(ArticleViewSet, self).retrieve(request, *args, **kwargs))
 
     def get_permissions(self):
         # Anyone can read
-        if self.action in ["list", "retrieve", "latest"]:
+        if self.action in ["list", "retrieve", "latest", "export", "changes", "batch"]:
             return [permissions.AllowAny()]
 
         # Any logged-in user can create
-        if self.action == "create":
+        if self.action in ("create", "bulk"):
             return [permissions.IsAuthenticated()]
 
         # Update/Delete: owner OR admin group (and must be logged in)